@@ -0,0 +1,11 @@
+from django.conf import settings
+
+SHARED_CACHE_BACKENDS = (
+    'django.core.cache.backends.memcached.',
+    'django.core.cache.backends.redis.',
+    'django_redis.',
+)
+
+
+def is_shared_cache(alias='default'):
+    return settings.CACHES[alias]['BACKEND'].startswith(SHARED_CACHE_BACKENDS)
@@ -0,0 +1,218 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+REGISTRY = []
+current_request = ContextVar('current_request_metrics', default=None)
+
+
+def escape(value):
+    return (str(value).replace('\\', '\\\\')
+            .replace('"', '\\"').replace('\n', '\\n'))
+
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        f'{name}="{escape(value)}"' for name, value in pairs
+    ) + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def render(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+        ]
+        with self.lock:
+            values = sorted(self.values.items())
+            lines.extend(self.render_samples(values))
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render_samples(self, values):
+        for labels, value in values:
+            yield (f'{self.name}{format_labels(self.labels, labels)} '
+                   f'{format_value(value)}')
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(),
+                 buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            sample = self.values.get(labels)
+            if sample is None:
+                sample = self.values[labels] = [
+                    [0] * (len(self.buckets) + 1), 0
+                ]
+            sample[0][index] += 1
+            sample[1] += value
+
+    def render_samples(self, values):
+        for labels, (counts, total) in values:
+            cumulative = 0
+            bounds = self.buckets + (float('inf'),)
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket = format_labels(
+                    self.labels, labels, [('le', format_value(bound))]
+                )
+                yield f'{self.name}_bucket{bucket} {cumulative}'
+            suffix = format_labels(self.labels, labels)
+            yield f'{self.name}_sum{suffix} {format_value(total)}'
+            yield f'{self.name}_count{suffix} {cumulative}'
+
+
+REQUEST_LABELS = ('method', 'view')
+
+requests_total = Counter(
+    'foodgram_http_requests_total',
+    'Количество обработанных запросов',
+    REQUEST_LABELS + ('status',)
+)
+request_duration = Histogram(
+    'foodgram_http_request_duration_seconds',
+    'Время обработки запроса',
+    REQUEST_LABELS
+)
+db_queries = Histogram(
+    'foodgram_db_queries_per_request',
+    'Количество SQL-запросов на один запрос',
+    REQUEST_LABELS,
+    QUERY_COUNT_BUCKETS
+)
+db_duration = Histogram(
+    'foodgram_db_duration_seconds',
+    'Суммарное время SQL-запросов на один запрос',
+    REQUEST_LABELS
+)
+serializer_duration = Histogram(
+    'foodgram_serializer_duration_seconds',
+    'Время сериализации ответа',
+    REQUEST_LABELS
+)
+cache_requests = Counter(
+    'foodgram_cache_requests_total',
+    'Обращения к кэшам приложения',
+    ('cache', 'result')
+)
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def observe(self, labels, status, duration):
+        requests_total.inc(*labels, str(status))
+        request_duration.observe(duration, *labels)
+        db_queries.observe(self.queries, *labels)
+        db_duration.observe(self.db_time, *labels)
+        serializer_duration.observe(self.serializer_time, *labels)
+
+
+def record_query(execute, sql, params, many, context):
+    state = current_request.get()
+    if state is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        state.db_time += time.perf_counter() - started
+        state.queries += 1
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+for existing in connections.all():
+    install_query_recorder(None, existing)
+
+
+def record_cache(cache_name, hit):
+    cache_requests.inc(cache_name, 'hit' if hit else 'miss')
+
+
+@contextmanager
+def serializer_timer():
+    state = current_request.get()
+    if state is None or state.serializer_depth:
+        yield
+        return
+    state.serializer_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        state.serializer_time += time.perf_counter() - started
+        state.serializer_depth -= 1
+
+
+class SerializerTimingMixin:
+
+    def to_representation(self, instance):
+        with serializer_timer():
+            return super().to_representation(instance)
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
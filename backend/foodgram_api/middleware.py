@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from django.utils.decorators import sync_and_async_middleware
+
+from .metrics import RequestMetrics, current_request
+
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+
+def observe(request, response, state, started):
+    match = request.resolver_match
+    labels = (
+        request.method if request.method in METHODS else 'OTHER',
+        match.view_name if match else 'unmatched',
+    )
+    state.observe(
+        labels, response.status_code, time.perf_counter() - started
+    )
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            state = RequestMetrics()
+            token = current_request.set(state)
+            started = time.perf_counter()
+            try:
+                response = await get_response(request)
+            finally:
+                current_request.reset(token)
+            observe(request, response, state, started)
+            return response
+    else:
+        def middleware(request):
+            state = RequestMetrics()
+            token = current_request.set(state)
+            started = time.perf_counter()
+            try:
+                response = get_response(request)
+            finally:
+                current_request.reset(token)
+            observe(request, response, state, started)
+            return response
+    return middleware
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 
@@ -28,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'foodgram_api.middleware.metrics_middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -72,6 +74,31 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'foodgram'),
+    },
+    'memberships': {
+        'BACKEND': os.environ.get(
+            'MEMBERSHIP_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get(
+            'MEMBERSHIP_CACHE_LOCATION', 'foodgram-memberships'
+        ),
+    },
+}
+
+REFERENCE_CACHE_TIMEOUT = 300
+FOLLOWED_AUTHORS_CACHE_TIMEOUT = 60 * 60
+MEMBERSHIP_CACHE_ALIAS = 'memberships'
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 60
+AUTH_TOKEN_CACHE_TIMEOUT = 5 * 60
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -101,13 +128,33 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'backend_static')
 MEDIA_URL = '/backend_media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'backend_media')
 
+SHOPPING_LIST_FONT = os.environ.get(
+    'SHOPPING_LIST_FONT', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+)
+SHOPPING_LIST_CACHE_DIR = os.environ.get(
+    'SHOPPING_LIST_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'foodgram-shopping-lists')
+)
+SHOPPING_LIST_CACHE_TIMEOUT = 24 * 60 * 60
+
+RECIPE_IMAGE_VARIANTS = {
+    'thumbnail': {'size': (480, 480), 'format': 'JPEG'},
+    'thumbnail_webp': {'size': (480, 480), 'format': 'WEBP'},
+    'webp': {'size': (1600, 1600), 'format': 'WEBP'},
+}
+RECIPE_IMAGE_WORKERS = 2
+RECIPE_IMAGE_MAX_SIZE = 15 * 1024 * 1024
+RECIPE_IMAGE_MAX_PIXELS = 40_000_000
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+RECIPE_IMAGE_ASYNC = True
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -115,6 +162,11 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 6,
 }
 
+RECIPE_FAST_SERIALIZER = True
+
+INGREDIENT_INDEX_ENABLED = True
+INGREDIENT_INDEX_TTL = 300
+
 DJOSER = {
     'LOGIN_FIELD': 'email',
 
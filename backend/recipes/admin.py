@@ -2,7 +2,7 @@ from django.contrib import admin
 
 from.models import (
     Favorite, Ingredient, IngredientRecipe, Recipe, Tag, PurchaseList,
-    Subscribe
+    ShoppingListItem, Subscribe
 )
 
 
@@ -18,10 +18,14 @@ class IngredientAdmin(admin.ModelAdmin):
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
     inlines = [IngredientRecipeInLine]
+    list_display = ('name', 'author', 'pub_date', 'favorites_count')
+    list_select_related = ('author',)
+    readonly_fields = ('favorites_count',)
 
 
 admin.site.register(Favorite)
 admin.site.register(IngredientRecipe)
 admin.site.register(PurchaseList)
+admin.site.register(ShoppingListItem)
 admin.site.register(Subscribe)
 admin.site.register(Tag)
@@ -0,0 +1,198 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import (
+    FileResponse, Http404, HttpResponse, StreamingHttpResponse
+)
+from django.shortcuts import get_object_or_404
+from rest_framework import exceptions
+from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .autocomplete import ingredient_index
+from .documents import DOCUMENT_TYPES, open_pdf, stream_document
+from .models import Recipe, ShoppingListItem
+from .parsers import Base64ImageParser
+from .permissions import AuthorOrReadOnly
+from .serializers import RecipeImageSerializer
+from .views import IngredientViewSet
+
+ingredient_list_view = IngredientViewSet.as_view({'get': 'list'})
+
+
+def get_authenticators():
+    return [
+        authentication_class()
+        for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    ]
+
+
+def authenticate(request):
+    for authenticator in get_authenticators():
+        result = authenticator.authenticate(request)
+        if result is not None:
+            return result[0]
+    return AnonymousUser()
+
+
+def render_json(data, status=200):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        content_type='application/json',
+        status=status
+    )
+
+
+def exception_response(request, exc):
+    if isinstance(exc, Http404):
+        exc = exceptions.NotFound()
+    if isinstance(exc.detail, (list, dict)):
+        data = exc.detail
+    else:
+        data = {'detail': exc.detail}
+    response = render_json(data, exc.status_code)
+    if isinstance(exc, (exceptions.NotAuthenticated,
+                        exceptions.AuthenticationFailed)):
+        authenticators = get_authenticators()
+        header = (authenticators[0].authenticate_header(request)
+                  if authenticators else None)
+        if header:
+            response['WWW-Authenticate'] = header
+        else:
+            response.status_code = 403
+    return response
+
+
+def async_api_view(methods):
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in methods:
+                    raise exceptions.MethodNotAllowed(request.method)
+                request.user = await sync_to_async(authenticate)(request)
+                if request.user.is_anonymous:
+                    raise exceptions.NotAuthenticated()
+                return await view(request, *args, **kwargs)
+            except (exceptions.APIException, Http404) as exc:
+                return exception_response(request, exc)
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+
+def get_quality(media_type):
+    try:
+        return float(media_type.params.get('q', 1))
+    except ValueError:
+        return 0
+
+
+def get_specificity(media_type):
+    if media_type.is_all_types:
+        return 0
+    return 1 if media_type.sub_type == '*' else 2
+
+
+def get_format_quality(accepted_types, content_type):
+    matches = [
+        (get_specificity(media_type), get_quality(media_type))
+        for media_type in accepted_types
+        if media_type.match(content_type.split(';')[0])
+    ]
+    return max(matches, default=(0, 0))
+
+
+def get_document_format(request):
+    document_format = request.GET.get('format')
+    if document_format is not None:
+        if document_format not in DOCUMENT_TYPES:
+            raise exceptions.NotFound()
+        return document_format
+    wildcard_quality = max((
+        get_quality(media_type) for media_type in request.accepted_types
+        if media_type.is_all_types
+    ), default=0)
+    qualities = {
+        document_format: get_format_quality(
+            request.accepted_types, content_type
+        )
+        for document_format, content_type in DOCUMENT_TYPES.items()
+    }
+    named = [
+        document_format
+        for document_format, (specificity, quality) in qualities.items()
+        if specificity and quality > wildcard_quality
+    ]
+    if named:
+        return max(named, key=lambda name: qualities[name][1])
+    acceptable = [
+        document_format
+        for document_format, (_, quality) in qualities.items() if quality
+    ]
+    if not acceptable:
+        raise exceptions.NotAcceptable()
+    return acceptable[0]
+
+
+def shopping_list_response(user, document_format):
+    ingredients = list(ShoppingListItem.objects.filter(user=user).values(
+        'ingredient__name', 'ingredient__measurement_unit', 'amount'
+    ).order_by('ingredient__name'))
+    filename = f'shopping_list.{document_format}'
+    content_type = DOCUMENT_TYPES[document_format]
+    if document_format == 'pdf':
+        return FileResponse(
+            open_pdf(ingredients), as_attachment=True, filename=filename,
+            content_type=content_type
+        )
+    response = StreamingHttpResponse(
+        stream_document(document_format, ingredients),
+        content_type=content_type
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@async_api_view(['GET', 'HEAD'])
+async def download_shopping_cart(request):
+    return await sync_to_async(shopping_list_response)(
+        request.user, get_document_format(request)
+    )
+
+
+def update_recipe_image(request, recipe_id):
+    recipe = get_object_or_404(Recipe, pk=recipe_id)
+    if not AuthorOrReadOnly().has_object_permission(request, None, recipe):
+        raise exceptions.PermissionDenied()
+    api_request = Request(
+        request, parsers=[MultiPartParser(), Base64ImageParser()]
+    )
+    serializer = RecipeImageSerializer(
+        recipe, data=api_request.data, context={'request': api_request}
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return serializer.data
+
+
+@async_api_view(['PUT'])
+async def recipe_image(request, recipe_id):
+    return render_json(
+        await sync_to_async(update_recipe_image)(request, recipe_id)
+    )
+
+
+async def ingredient_list(request):
+    name = request.GET.get('name')
+    if (request.method != 'GET' or not name
+            or not settings.INGREDIENT_INDEX_ENABLED):
+        return await sync_to_async(ingredient_list_view)(request)
+    index = ingredient_index.get_fresh_index()
+    if index is None:
+        index = await sync_to_async(ingredient_index.get_index)()
+    return render_json(ingredient_index.search(name, index))
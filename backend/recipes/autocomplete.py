@@ -0,0 +1,65 @@
+import bisect
+import threading
+import time
+from operator import itemgetter
+
+from django.conf import settings
+
+from .models import Ingredient
+
+
+class IngredientIndex:
+    fields = ('id', 'name', 'measurement_unit')
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._index = None
+
+    def invalidate(self):
+        self._index = None
+
+    def _build(self):
+        rows = Ingredient.objects.values_list(*self.fields).order_by('name')
+        entries = sorted(
+            ((name.lower(), dict(zip(self.fields, (pk, name, unit))))
+             for pk, name, unit in rows),
+            key=itemgetter(0)
+        )
+        keys = [key for key, _ in entries]
+        items = [item for _, item in entries]
+        return keys, items, time.monotonic() + self.ttl
+
+    def get_fresh_index(self):
+        index = self._index
+        if index is None or index[2] < time.monotonic():
+            return None
+        return index
+
+    def get_index(self):
+        index = self.get_fresh_index()
+        if index is None:
+            with self._lock:
+                index = self._index
+                if index is None or index[2] < time.monotonic():
+                    index = self._index = self._build()
+        return index
+
+    def search(self, query, index=None):
+        query = query.strip().lower()
+        keys, items, _ = index or self.get_index()
+        if not query:
+            return list(items)
+        start = bisect.bisect_left(keys, query)
+        end = start
+        while end < len(keys) and keys[end].startswith(query):
+            end += 1
+        prefixed = items[start:end]
+        contained = [
+            item for position, (key, item) in enumerate(zip(keys, items))
+            if query in key and not start <= position < end
+        ]
+        return prefixed + contained
+
+
+ingredient_index = IngredientIndex(settings.INGREDIENT_INDEX_TTL)
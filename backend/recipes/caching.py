@@ -0,0 +1,90 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from rest_framework.renderers import JSONRenderer
+
+from foodgram_api.cache import is_shared_cache
+from foodgram_api.metrics import record_cache
+
+from .models import CacheVersion
+
+VERSION_KEY = 'version:{}'
+CONTENT_KEY = 'content:{}:{}:{}'
+
+
+def get_cached_versions(namespaces):
+    keys = [VERSION_KEY.format(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), settings.REFERENCE_CACHE_TIMEOUT)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_versions(*namespaces):
+    if is_shared_cache():
+        return get_cached_versions(namespaces)
+    versions = dict(CacheVersion.objects.filter(
+        namespace__in=namespaces
+    ).values_list('namespace', 'version'))
+    return [versions.get(namespace, 0) for namespace in namespaces]
+
+
+def get_version(namespace):
+    return get_versions(namespace)[0]
+
+
+def bump_version(namespace):
+    if is_shared_cache():
+        cache.set(
+            VERSION_KEY.format(namespace),
+            time.time_ns(),
+            settings.REFERENCE_CACHE_TIMEOUT
+        )
+        return
+    updated = CacheVersion.objects.filter(namespace=namespace).update(
+        version=F('version') + 1
+    )
+    if not updated:
+        CacheVersion.objects.get_or_create(
+            namespace=namespace, defaults={'version': 1}
+        )
+
+
+class VersionedCacheMixin:
+    cache_namespace = None
+    cache_timeout = settings.REFERENCE_CACHE_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        version = get_version(self.cache_namespace)
+        etag = quote_etag(f'{self.cache_namespace}-{version}')
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        key = CONTENT_KEY.format(
+            self.cache_namespace, version, request.get_full_path()
+        )
+        content = cache.get(key)
+        record_cache(self.cache_namespace, content is not None)
+        if content is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            content = JSONRenderer().render(response.data)
+            cache.set(key, content, self.cache_timeout)
+        response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = etag
+        return response
@@ -0,0 +1,90 @@
+import hashlib
+
+from django.db.models import Exists, OuterRef
+from django.utils.cache import (
+    get_conditional_response, patch_vary_headers, quote_etag
+)
+from django.utils.http import http_date
+
+from .caching import get_versions
+from .memberships import get_user_recipe_ids
+from .models import Favorite, PurchaseList, Recipe, Subscribe
+from .representations import AUTHOR_FIELDS
+
+
+def make_etag(*parts):
+    parts += tuple(get_versions('tags', 'ingredients'))
+    digest = hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def get_recipe_validators(request, recipe_id):
+    user = request.user
+    recipes = Recipe.objects.filter(pk=recipe_id)
+    fields = ['updated_at', *AUTHOR_FIELDS]
+    if user.is_authenticated:
+        recipes = recipes.annotate(is_subscribed=Exists(
+            Subscribe.objects.filter(user=user, author=OuterRef('author'))
+        ))
+        fields.append('is_subscribed')
+    state = recipes.values_list(*fields).first()
+    if state is None:
+        return None, None
+    updated_at = state[0]
+    etag = make_etag(
+        'recipe', recipe_id, user.pk, updated_at, *state[1:],
+        recipe_id in get_user_recipe_ids(user, Favorite),
+        recipe_id in get_user_recipe_ids(user, PurchaseList)
+    )
+    if user.is_authenticated:
+        return etag, None
+    return etag, int(updated_at.timestamp())
+
+
+def get_recipe_state(recipe):
+    if isinstance(recipe, dict):
+        return (
+            recipe['id'], recipe['updated_at'], recipe['author_id'],
+            tuple(recipe[field] for field in AUTHOR_FIELDS)
+        )
+    author = recipe.author
+    return (
+        recipe.pk, recipe.updated_at, recipe.author_id,
+        (author.email, author.username, author.first_name, author.last_name)
+    )
+
+
+def get_recipe_list_validators(request, page, paginator, followed):
+    user = request.user
+    favorite_ids = get_user_recipe_ids(user, Favorite)
+    cart_ids = get_user_recipe_ids(user, PurchaseList)
+    items = [
+        (recipe_id, updated_at, author, recipe_id in favorite_ids,
+         recipe_id in cart_ids, author_id in followed)
+        for recipe_id, updated_at, author_id, author
+        in map(get_recipe_state, page)
+    ]
+    return make_etag(
+        'recipes', user.pk, paginator.get_count(),
+        paginator.get_next_link(), paginator.get_previous_link(), items
+    ), None
+
+
+def conditional_response(request, validators, handler):
+    etag, last_modified = validators
+    if etag is None:
+        return handler()
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if not_modified is None:
+        response = handler()
+        if response.status_code != 200:
+            return response
+    else:
+        response = not_modified
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ['Authorization'])
+    return response
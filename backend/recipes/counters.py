@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Favorite, Recipe
+
+User = get_user_model()
+
+
+def change_favorites_count(recipe_id, delta):
+    Recipe.objects.filter(pk=recipe_id).update(
+        favorites_count=Greatest(F('favorites_count') + delta, Value(0))
+    )
+
+
+def change_recipes_count(user_id, delta):
+    User.objects.filter(pk=user_id).update(
+        recipes_count=Greatest(F('recipes_count') + delta, Value(0))
+    )
+
+
+def count_subquery(model, field):
+    return Coalesce(Subquery(
+        model.objects.filter(**{field: OuterRef('pk')}).order_by().values(
+            field
+        ).annotate(total=Count('pk')).values('total')
+    ), Value(0))
+
+
+def recount():
+    favorites = Recipe.objects.exclude(
+        favorites_count=count_subquery(Favorite, 'recipe')
+    ).update(favorites_count=count_subquery(Favorite, 'recipe'))
+    recipes = User.objects.exclude(
+        recipes_count=count_subquery(Recipe, 'author')
+    ).update(recipes_count=count_subquery(Recipe, 'author'))
+    return favorites, recipes
@@ -0,0 +1,176 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from foodgram_api.metrics import record_cache
+
+DOCUMENT_TYPES = {
+    'pdf': 'application/pdf',
+    'csv': 'text/csv; charset=utf-8',
+    'txt': 'text/plain; charset=utf-8',
+}
+PDF_LAYOUT_VERSION = 1
+FONT_NAME = 'ShoppingListFont'
+HEADER = ('Ингредиент', 'Количество', 'Единица измерения')
+FOOTER = 'FoodGram, 2021'
+
+_font_registered = False
+_font_lock = threading.Lock()
+
+
+def register_font():
+    global _font_registered
+    if not _font_registered:
+        with _font_lock:
+            if not _font_registered:
+                pdfmetrics.registerFont(
+                    TTFont(FONT_NAME, settings.SHOPPING_LIST_FONT)
+                )
+                _font_registered = True
+
+
+class LineBuffer:
+
+    def write(self, line):
+        return line
+
+
+def iter_rows(items):
+    for item in items:
+        yield (item['ingredient__name'], item['amount'],
+               item['ingredient__measurement_unit'])
+
+
+def get_rows(items):
+    return list(iter_rows(items))
+
+
+def stream_txt(items):
+    for name, amount, measurement_unit in iter_rows(items):
+        yield f'{name} ({measurement_unit}) — {amount} \n'.encode()
+    yield f'\n{FOOTER}'.encode()
+
+
+def stream_csv(items):
+    writer = csv.writer(LineBuffer())
+    yield writer.writerow(HEADER).encode('utf-8-sig')
+    for row in iter_rows(items):
+        yield writer.writerow(row).encode()
+
+
+def draw_footer(canvas, document):
+    canvas.saveState()
+    canvas.setFont(FONT_NAME, 9)
+    canvas.setFillColor(colors.grey)
+    canvas.drawString(document.leftMargin, 10 * mm, FOOTER)
+    canvas.drawRightString(
+        document.pagesize[0] - document.rightMargin, 10 * mm,
+        f'Страница {document.page}'
+    )
+    canvas.restoreState()
+
+
+def render_pdf(items):
+    register_font()
+    text = ParagraphStyle('text', fontName=FONT_NAME, fontSize=11, leading=14)
+    title = ParagraphStyle(
+        'title', parent=text, fontSize=18, leading=22, spaceAfter=6 * mm
+    )
+    buffer = io.BytesIO()
+    document = SimpleDocTemplate(
+        buffer, pagesize=A4, title='Список покупок', author='FoodGram',
+        leftMargin=20 * mm, rightMargin=20 * mm,
+        topMargin=20 * mm, bottomMargin=20 * mm
+    )
+    story = [Paragraph('Список покупок', title)]
+    rows = get_rows(items)
+    if rows:
+        table = Table(
+            [[Paragraph(escape(cell), text) for cell in HEADER]] + [
+                [Paragraph(escape(name), text), amount,
+                 Paragraph(escape(measurement_unit), text)]
+                for name, amount, measurement_unit in rows
+            ],
+            colWidths=[document.width * 0.55, document.width * 0.2,
+                       document.width * 0.25],
+            repeatRows=1
+        )
+        table.setStyle(TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+            ('LINEBELOW', (0, 0), (-1, 0), 1, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1),
+             [colors.white, colors.HexColor('#F2F2F2')]),
+        ]))
+        story.append(table)
+    else:
+        story.append(Paragraph('Список покупок пуст.', text))
+    document.build(story, onFirstPage=draw_footer, onLaterPages=draw_footer)
+    return buffer.getvalue()
+
+
+def get_cache_path(items):
+    digest = hashlib.sha256(json.dumps(
+        [PDF_LAYOUT_VERSION, get_rows(items)], ensure_ascii=False
+    ).encode()).hexdigest()
+    return os.path.join(settings.SHOPPING_LIST_CACHE_DIR, f'{digest}.pdf')
+
+
+def prune_cache():
+    expired = time.time() - settings.SHOPPING_LIST_CACHE_TIMEOUT
+    with os.scandir(settings.SHOPPING_LIST_CACHE_DIR) as entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < expired:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def write_cache(path, content):
+    os.makedirs(settings.SHOPPING_LIST_CACHE_DIR, exist_ok=True)
+    prune_cache()
+    with tempfile.NamedTemporaryFile(
+        dir=settings.SHOPPING_LIST_CACHE_DIR, suffix='.tmp', delete=False
+    ) as file:
+        file.write(content)
+    os.replace(file.name, path)
+
+
+def open_pdf(items):
+    path = get_cache_path(items)
+    try:
+        file = open(path, 'rb')
+    except FileNotFoundError:
+        record_cache('shopping_list_pdf', False)
+        write_cache(path, render_pdf(items))
+        return open(path, 'rb')
+    record_cache('shopping_list_pdf', True)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+    return file
+
+
+def stream_document(document_format, items):
+    if document_format == 'csv':
+        return stream_csv(items)
+    return stream_txt(items)
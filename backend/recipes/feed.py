@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from foodgram_api.cache import is_shared_cache
+from foodgram_api.metrics import record_cache
+
+from .models import Subscribe
+
+FOLLOWED_AUTHORS_KEY = 'followed_authors:{}'
+
+
+def load_followed_author_ids(user_id):
+    return list(
+        Subscribe.objects.filter(user_id=user_id).values_list(
+            'author_id', flat=True
+        )
+    )
+
+
+def get_followed_author_ids(user_id):
+    if not is_shared_cache():
+        return load_followed_author_ids(user_id)
+    key = FOLLOWED_AUTHORS_KEY.format(user_id)
+    author_ids = cache.get(key)
+    record_cache('followed_authors', author_ids is not None)
+    if author_ids is None:
+        author_ids = load_followed_author_ids(user_id)
+        cache.set(key, author_ids, settings.FOLLOWED_AUTHORS_CACHE_TIMEOUT)
+    return author_ids
+
+
+def get_user_followed_author_ids(user):
+    if user.is_anonymous:
+        return frozenset()
+    return frozenset(get_followed_author_ids(user.id))
+
+
+def invalidate_followed_authors(user_id):
+    if is_shared_cache():
+        cache.delete(FOLLOWED_AUTHORS_KEY.format(user_id))
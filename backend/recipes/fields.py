@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from rest_framework import serializers
+
+from .images import get_variant_urls
+from .uploads import decode_base64, iter_string, size_error, validate_image
+
+
+class ImageVariantsField(serializers.Field):
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return get_variant_urls(value, self.context.get('request'))
+
+
+class StreamingImageField(serializers.ImageField):
+    default_error_messages = {
+        'invalid_image': 'Передайте изображение файлом или строкой base64.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            if len(data) * 3 // 4 > settings.RECIPE_IMAGE_MAX_SIZE:
+                raise size_error()
+            data = decode_base64(iter_string(data))
+        elif not isinstance(data, UploadedFile):
+            self.fail('invalid_image')
+        return validate_image(data)
@@ -1,7 +1,14 @@
+import re
+
+from django.db import connection
+from django.db.models import (
+    Case, Exists, IntegerField, OuterRef, Q, Value, When
+)
+from django.db.models.expressions import RawSQL
 from django_filters import rest_framework as filters
-from rest_framework.filters import SearchFilter as BaseSearchFilter
+from rest_framework.filters import BaseFilterBackend
 
-from .models import Recipe, Tag
+from .models import Favorite, PurchaseList, Recipe, Tag
 
 
 class RecipeFilter(filters.FilterSet):
@@ -10,23 +17,97 @@ class RecipeFilter(filters.FilterSet):
     tags = filters.ModelMultipleChoiceFilter(
         field_name='tags__slug',
         to_field_name='slug',
-        queryset=Tag.objects.all()
+        queryset=Tag.objects.all(),
+        method='get_tags'
     )
+    search = filters.CharFilter(method='get_search')
 
     class Meta:
         model = Recipe
-        fields = ('is_favorited', 'is_in_shopping_cart', 'author', 'tags',)
+        fields = (
+            'is_favorited', 'is_in_shopping_cart', 'author', 'tags', 'search',
+        )
+
+    def filter_by_user(self, queryset, model, value):
+        if not value:
+            return queryset
+        user = self.request.user
+        if user.is_anonymous:
+            return queryset.none()
+        return queryset.filter(Exists(
+            model.objects.filter(user=user, recipe=OuterRef('pk'))
+        ))
 
     def get_favorites(self, queryset, name, value):
-        if value:
-            return Recipe.objects.filter(favorited_by__user=self.request.user)
-        return Recipe.objects.all()
+        return self.filter_by_user(queryset, Favorite, value)
 
     def get_in_shopping_cart(self, queryset, name, value):
-        if value:
-            return Recipe.objects.filter(customers__user=self.request.user)
-        return Recipe.objects.all()
+        return self.filter_by_user(queryset, PurchaseList, value)
+
+    def get_tags(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.filter(Exists(
+            Recipe.tags.through.objects.filter(
+                recipe=OuterRef('pk'), tag__in=value
+            )
+        ))
+
+    def get_search(self, queryset, name, value):
+        value = value.strip()
+        if not value:
+            return queryset
+        if connection.vendor == 'postgresql':
+            return self.search_vector(queryset, value)
+        return self.search_substring(queryset, value)
 
+    @staticmethod
+    def search_vector(queryset, value):
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVectorField
+        )
+        query = SearchQuery(value, config='russian', search_type='websearch')
+        vector = RawSQL(
+            f'{connection.ops.quote_name(Recipe._meta.db_table)}'
+            '.search_vector', [],
+            output_field=SearchVectorField()
+        )
+        return queryset.alias(
+            search_vector=vector,
+            search_rank=SearchRank(vector, query)
+        ).filter(search_vector=query).order_by(
+            '-search_rank', '-pub_date', '-id'
+        )
 
-class SearchFilter(BaseSearchFilter):
+    @staticmethod
+    def search_substring(queryset, value):
+        for word in value.split():
+            pattern = re.escape(word)
+            queryset = queryset.filter(
+                Q(name__iregex=pattern) | Q(text__iregex=pattern)
+            )
+        pattern = re.escape(value)
+        return queryset.alias(
+            search_rank=Case(
+                When(name__iregex=pattern, then=Value(2)),
+                When(text__iregex=pattern, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField()
+            )
+        ).order_by('-search_rank', '-pub_date', '-id')
+
+
+class IngredientSearchFilter(BaseFilterBackend):
     search_param = 'name'
+
+    def filter_queryset(self, request, queryset, view):
+        name = request.query_params.get(self.search_param, '').strip()
+        if not name:
+            return queryset
+        return queryset.filter(name__icontains=name).annotate(
+            is_substring=Case(
+                When(name__istartswith=name, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField()
+            )
+        ).order_by('is_substring', 'name')
@@ -0,0 +1,116 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image
+
+from .models import Recipe
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = 'recipes/images/variants/'
+EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.RECIPE_IMAGE_WORKERS,
+                    thread_name_prefix='recipe-images'
+                )
+    return _executor
+
+
+def needs_variants(recipe):
+    return bool(recipe.image) and (
+        recipe.image_variants.get('source') != recipe.image.name
+    )
+
+
+def render_variant(image, size, image_format):
+    variant = image.copy()
+    variant.thumbnail(size, Image.LANCZOS)
+    if image_format == 'JPEG' and variant.mode != 'RGB':
+        variant = variant.convert('RGB')
+    buffer = BytesIO()
+    variant.save(buffer, image_format, quality=82, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_variants(recipe_id):
+    recipe = Recipe.objects.filter(pk=recipe_id).only(
+        'image', 'image_variants'
+    ).first()
+    if recipe is None or not needs_variants(recipe):
+        return
+    source = recipe.image.name
+    stem = os.path.splitext(os.path.basename(source))[0]
+    variants = {'source': source}
+    with default_storage.open(source) as file, Image.open(file) as image:
+        image.load()
+        for name, options in settings.RECIPE_IMAGE_VARIANTS.items():
+            extension = EXTENSIONS[options['format']]
+            variants[name] = default_storage.save(
+                f'{VARIANTS_DIR}{stem}_{name}.{extension}',
+                render_variant(image, options['size'], options['format'])
+            )
+    updated = Recipe.objects.filter(pk=recipe_id, image=source).update(
+        image_variants=variants, updated_at=timezone.now()
+    )
+    if not updated:
+        for name, path in variants.items():
+            if name != 'source':
+                default_storage.delete(path)
+
+
+def run_generate_variants(recipe_id):
+    try:
+        generate_variants(recipe_id)
+    except Exception:
+        logger.exception(
+            'Не удалось подготовить изображения рецепта %s', recipe_id
+        )
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(recipe):
+    if not needs_variants(recipe):
+        return
+    if settings.RECIPE_IMAGE_ASYNC:
+        transaction.on_commit(
+            lambda: get_executor().submit(run_generate_variants, recipe.pk)
+        )
+    else:
+        transaction.on_commit(lambda: generate_variants(recipe.pk))
+
+
+def get_variant_urls(recipe, request=None):
+    return build_variant_urls(
+        recipe.image.name, recipe.image_variants, request
+    )
+
+
+def build_variant_urls(image, variants, request=None):
+    if not image:
+        return {name: None for name in settings.RECIPE_IMAGE_VARIANTS}
+    if variants.get('source') != image:
+        variants = {}
+    urls = {}
+    for name in settings.RECIPE_IMAGE_VARIANTS:
+        url = default_storage.url(variants.get(name, image))
+        urls[name] = request.build_absolute_uri(url) if request else url
+    return urls
@@ -0,0 +1,69 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from recipes.filters import RecipeFilter
+from recipes.models import Recipe, Tag
+
+User = get_user_model()
+
+
+def get_combinations(user, tags):
+    slugs = [('tags', slug) for slug in tags]
+    return [
+        [],
+        slugs[:1],
+        slugs,
+        [('is_favorited', '1')],
+        [('is_favorited', '0')] + slugs[:1],
+        [('is_favorited', '1')] + slugs,
+        [('is_in_shopping_cart', '1')],
+        [('is_in_shopping_cart', '1'), ('author', str(user.pk))],
+        [('is_favorited', '1'), ('is_in_shopping_cart', '1')] + slugs[:2],
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время фильтрации рецептов на типичных комбинациях'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='email пользователя')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--limit', type=int, default=6)
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('pk')
+        if options['user']:
+            users = users.filter(email=options['user'])
+        user = users.first()
+        if user is None:
+            raise CommandError('Пользователь не найден.')
+        tags = list(Tag.objects.values_list('slug', flat=True)[:3])
+        factory = APIRequestFactory()
+        for params in get_combinations(user, tags):
+            django_request = factory.get('/api/recipes/', params)
+            force_authenticate(django_request, user=user)
+            request = Request(django_request)
+            request.user = user
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    queryset = RecipeFilter(
+                        request.query_params,
+                        queryset=Recipe.objects.all(),
+                        request=request
+                    ).qs
+                    found = len(queryset[:options['limit']])
+                elapsed = time.perf_counter() - started
+            query = '&'.join(f'{key}={value}' for key, value in params)
+            self.stdout.write(
+                f'{query or "(без фильтров)":<60} '
+                f'{elapsed / options["repeat"] * 1000:8.2f} мс  '
+                f'запросов: {len(queries) // options["repeat"]}  '
+                f'найдено: {found}'
+            )
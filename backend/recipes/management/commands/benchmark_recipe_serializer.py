@@ -0,0 +1,69 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from recipes.feed import get_user_followed_author_ids
+from recipes.models import Recipe
+from recipes.renderers import FastJSONRenderer, orjson
+from recipes.representations import RECIPE_FIELDS, represent_recipes
+from recipes.serializers import RecipeListSerializer
+
+User = get_user_model()
+
+
+def render_serializer(request, limit):
+    recipes = Recipe.objects.with_related(request.user)[:limit]
+    return JSONRenderer().render(RecipeListSerializer(
+        recipes, many=True, context={'request': request}
+    ).data)
+
+
+def render_fast(request, limit):
+    recipes = list(Recipe.objects.values(*RECIPE_FIELDS)[:limit])
+    return FastJSONRenderer().render(represent_recipes(
+        recipes, request, get_user_followed_author_ids(request.user)
+    ))
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает скорость сериализаторов DRF и быстрого режима '
+            'на странице списка рецептов')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='email пользователя')
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--limit', type=int, default=50)
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('pk')
+        if options['user']:
+            users = users.filter(email=options['user'])
+        user = users.first()
+        if user is None:
+            raise CommandError('Пользователь не найден.')
+        request = Request(APIRequestFactory().get('/api/recipes/'))
+        request.user = user
+        self.stdout.write(
+            f'Кодировщик JSON: {"orjson" if orjson else "json"}'
+        )
+        results = {}
+        for name, render in (('DRF', render_serializer),
+                             ('быстрый', render_fast)):
+            render(request, options['limit'])
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                content = render(request, options['limit'])
+            elapsed = time.perf_counter() - started
+            results[name] = elapsed / options['repeat']
+            self.stdout.write(
+                f'{name:<10} {results[name] * 1000:8.2f} мс/страница  '
+                f'{options["limit"] / results[name]:10.0f} рецептов/с  '
+                f'{len(content)} байт'
+            )
+        self.stdout.write(
+            f'Ускорение: {results["DRF"] / results["быстрый"]:.1f}x'
+        )
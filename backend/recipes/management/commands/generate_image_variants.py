@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from recipes.images import generate_variants, needs_variants
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = 'Готовит уменьшенные копии и WebP-варианты изображений рецептов'
+
+    def handle(self, *args, **options):
+        processed = 0
+        recipes = Recipe.objects.exclude(image='').exclude(
+            image__isnull=True
+        ).only('image', 'image_variants')
+        for recipe in recipes.iterator():
+            if needs_variants(recipe):
+                generate_variants(recipe.pk)
+                processed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано рецептов: {processed}'
+        ))
@@ -1,16 +1,143 @@
 import csv
+import io
+import json
+import time
+from itertools import islice
+from pathlib import Path
 
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 
+from recipes.autocomplete import ingredient_index
+from recipes.caching import bump_version
 from recipes.models import Ingredient
 
+DEFAULT_PATH = Path(settings.BASE_DIR) / 'recipes' / 'data' / 'ingredients.csv'
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+def read_csv(file):
+    for row in csv.reader(file):
+        if row:
+            name, unit = row
+            yield name.strip(), unit.strip()
+
+
+def read_json(file):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    while True:
+        chunk = file.read(JSON_CHUNK_SIZE)
+        buffer += chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if not started and buffer[position:position + 1] == '[':
+                started = True
+                position += 1
+                continue
+            if buffer[position:position + 1] == ']':
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if not chunk:
+                    raise CommandError('Некорректный JSON-файл.')
+                break
+            yield (
+                item.get('name', item.get('title')).strip(),
+                item.get('measurement_unit', item.get('dimension')).strip(),
+            )
+        buffer = buffer[position:]
+
+
+def batches(rows, size):
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def copy_batch(cursor, batch):
+    data = io.StringIO()
+    csv.writer(data).writerows(batch)
+    data.seek(0)
+    cursor.copy_expert(
+        'COPY ingredient_import (name, measurement_unit) '
+        'FROM STDIN WITH (FORMAT csv)',
+        data
+    )
+
+
+def load_with_copy(rows, batch_size):
+    table = Ingredient._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'CREATE TEMP TABLE ingredient_import '
+            '(name varchar(256), measurement_unit varchar(256)) '
+            'ON COMMIT DROP'
+        )
+        for batch in batches(rows, batch_size):
+            copy_batch(cursor, batch)
+        cursor.execute(
+            f'INSERT INTO {table} (name, measurement_unit) '
+            'SELECT DISTINCT name, measurement_unit FROM ingredient_import '
+            'ON CONFLICT (name, measurement_unit) DO NOTHING'
+        )
+
+
+def load_with_bulk_create(rows, batch_size):
+    for batch in batches(rows, batch_size):
+        Ingredient.objects.bulk_create(
+            [Ingredient(name=name, measurement_unit=unit)
+             for name, unit in batch],
+            ignore_conflicts=True
+        )
+
 
 class Command(BaseCommand):
-    help = 'Closes the specified poll for voting'
+    help = 'Загружает справочник ингредиентов из CSV- или JSON-файла'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default=str(DEFAULT_PATH))
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Не использовать COPY даже на PostgreSQL'
+        )
 
     def handle(self, *args, **options):
-        with open('recipes/data/ingredients.csv') as file:
-            file_reader = csv.reader(file)
-            for row in file_reader:
-                name, unit = row
-                Ingredient.objects.get_or_create(name=name, measurement_unit=unit)
+        path = Path(options['path'])
+        if path.suffix not in ('.csv', '.json'):
+            raise CommandError('Поддерживаются только файлы .csv и .json')
+        reader = read_json if path.suffix == '.json' else read_csv
+        use_copy = (connection.vendor == 'postgresql'
+                    and not options['no_copy'])
+        load = load_with_copy if use_copy else load_with_bulk_create
+
+        read = 0
+
+        def counted(rows):
+            nonlocal read
+            for row in rows:
+                read += 1
+                yield row
+
+        before = Ingredient.objects.count()
+        started = time.perf_counter()
+        with open(path, encoding='utf-8') as file, transaction.atomic():
+            load(counted(reader(file)), options['batch_size'])
+        elapsed = time.perf_counter() - started
+        ingredient_index.invalidate()
+        bump_version('ingredients')
+        created = Ingredient.objects.count() - before
+        self.stdout.write(self.style.SUCCESS(
+            f'Прочитано строк: {read}, добавлено: {created}, '
+            f'{read / elapsed if elapsed else read:.0f} строк/с '
+            f'({"COPY" if use_copy else "bulk_create"}, {elapsed:.2f} с)'
+        ))
@@ -0,0 +1,90 @@
+import threading
+import time
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = (
+    '/api/recipes/download_shopping_cart/',
+    '/api/ingredients/?name=%D1%81%D0%B0',
+    '/api/recipes/',
+)
+
+
+def percentile(values, share):
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест запущенного сервера: параллельно запрашивает '
+            'эндпоинты и выводит пропускную способность и задержки. '
+            'Запустите для SERVER_MODE=wsgi и SERVER_MODE=asgi и сравните')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths')
+        parser.add_argument('--token', help='токен пользователя')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument('--timeout', type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options['token']:
+            headers['Authorization'] = f'Token {options["token"]}'
+        for path in options['paths'] or DEFAULT_PATHS:
+            self.run(
+                options['url'].rstrip('/') + path, headers,
+                options['concurrency'], options['duration'],
+                options['timeout']
+            )
+
+    def run(self, url, headers, concurrency, duration, timeout):
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+
+        def worker():
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    with urlopen(Request(url, headers=headers),
+                                 timeout=timeout) as response:
+                        response.read()
+                    error = None
+                except HTTPError as exc:
+                    error = exc.code
+                except (URLError, OSError) as exc:
+                    error = type(exc).__name__
+                elapsed = time.perf_counter() - started
+                with lock:
+                    if error is None:
+                        latencies.append(elapsed)
+                    else:
+                        errors.append(error)
+
+        threads = [
+            threading.Thread(target=worker, daemon=True)
+            for _ in range(concurrency)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        if not latencies and errors:
+            raise CommandError(f'{url}: все запросы неуспешны ({errors[0]})')
+        latencies.sort()
+        self.stdout.write(
+            f'{url}\n'
+            f'  запросов: {len(latencies)}, ошибок: {len(errors)}, '
+            f'{len(latencies) / elapsed:.1f} запр/с\n'
+            f'  p50 {percentile(latencies, 0.5) * 1000:.1f} мс, '
+            f'p95 {percentile(latencies, 0.95) * 1000:.1f} мс, '
+            f'p99 {percentile(latencies, 0.99) * 1000:.1f} мс'
+        )
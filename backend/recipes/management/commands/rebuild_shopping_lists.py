@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.shopping_list import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает списки покупок пользователей по их корзинам'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            created = rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Позиций в списках покупок: {created}'
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.counters import recount
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает счётчики избранного у рецептов '
+            'и количества рецептов у пользователей')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            favorites, recipes = recount()
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено рецептов: {favorites}, пользователей: {recipes}'
+        ))
@@ -0,0 +1,74 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from foodgram_api.cache import is_shared_cache
+from foodgram_api.metrics import record_cache
+
+from .models import Favorite, PurchaseList
+
+MEMBERSHIP_KEY = 'memberships:{}:{}:{}'
+MEMBERSHIP_VERSION_KEY = 'memberships_version:{}:{}'
+MEMBERSHIP_KINDS = {Favorite: 'favorites', PurchaseList: 'shopping_cart'}
+
+
+def get_cache():
+    return caches[settings.MEMBERSHIP_CACHE_ALIAS]
+
+
+def get_version_key(model, user_id):
+    return MEMBERSHIP_VERSION_KEY.format(MEMBERSHIP_KINDS[model], user_id)
+
+
+def get_version(cache, model, user_id):
+    key = get_version_key(model, user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), settings.MEMBERSHIP_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def load_recipe_ids(model, user_id):
+    return frozenset(
+        model.objects.filter(user_id=user_id).values_list(
+            'recipe_id', flat=True
+        )
+    )
+
+
+def get_recipe_ids(model, user_id):
+    if not is_shared_cache(settings.MEMBERSHIP_CACHE_ALIAS):
+        return load_recipe_ids(model, user_id)
+    cache = get_cache()
+    key = MEMBERSHIP_KEY.format(
+        MEMBERSHIP_KINDS[model], user_id, get_version(cache, model, user_id)
+    )
+    recipe_ids = cache.get(key)
+    record_cache(MEMBERSHIP_KINDS[model], recipe_ids is not None)
+    if recipe_ids is None:
+        recipe_ids = load_recipe_ids(model, user_id)
+        cache.set(key, recipe_ids, settings.MEMBERSHIP_CACHE_TIMEOUT)
+    return recipe_ids
+
+
+def get_user_recipe_ids(user, model):
+    if user.is_anonymous:
+        return frozenset()
+    return get_recipe_ids(model, user.id)
+
+
+def invalidate_recipe_ids(model, user_id):
+    if not is_shared_cache(settings.MEMBERSHIP_CACHE_ALIAS):
+        return
+
+    def invalidate():
+        cache = get_cache()
+        key = get_version_key(model, user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), settings.MEMBERSHIP_CACHE_TIMEOUT)
+    transaction.on_commit(invalidate)
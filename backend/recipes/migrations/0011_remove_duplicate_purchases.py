@@ -0,0 +1,48 @@
+# Generated by Django 3.2.5 on 2026-10-18 19:00
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_purchases(apps, schema_editor):
+    PurchaseList = apps.get_model('recipes', 'PurchaseList')
+    IngredientRecipe = apps.get_model('recipes', 'IngredientRecipe')
+    ShoppingListItem = apps.get_model('recipes', 'ShoppingListItem')
+    duplicates = PurchaseList.objects.values('user', 'recipe').annotate(
+        keep=Min('id'), total=Count('id')
+    ).filter(total__gt=1).order_by()
+    users = set()
+    for group in duplicates:
+        PurchaseList.objects.filter(
+            user_id=group['user'], recipe_id=group['recipe']
+        ).exclude(id=group['keep']).delete()
+        users.add(group['user'])
+    if not users:
+        return
+    ShoppingListItem.objects.filter(user_id__in=users).delete()
+    totals = IngredientRecipe.objects.filter(
+        recipe__customers__user__in=users
+    ).values(
+        'recipe__customers__user', 'ingredient'
+    ).annotate(total=models.Sum('amount')).order_by()
+    ShoppingListItem.objects.bulk_create(
+        (ShoppingListItem(
+            user_id=row['recipe__customers__user'],
+            ingredient_id=row['ingredient'],
+            amount=row['total']
+        ) for row in totals.iterator()),
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_shoppinglistitem'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_purchases, migrations.RunPython.noop
+        ),
+    ]
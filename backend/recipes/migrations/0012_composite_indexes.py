@@ -0,0 +1,33 @@
+# Generated by Django 3.2.5 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0011_remove_duplicate_purchases'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favorite',
+            index=models.Index(fields=['recipe', 'user'], name='favorite_recipe_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaselist',
+            index=models.Index(fields=['recipe', 'user'], name='purchase_recipe_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-pub_date', '-id'], name='recipe_author_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscribe',
+            index=models.Index(fields=['author', 'user'], name='subscribe_author_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='purchaselist',
+            constraint=models.UniqueConstraint(fields=('user', 'recipe'), name='unique_purchase'),
+        ),
+    ]
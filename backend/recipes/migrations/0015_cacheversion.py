@@ -0,0 +1,34 @@
+# Generated by Django 3.2.5 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    CacheVersion = apps.get_model('recipes', 'CacheVersion')
+    CacheVersion.objects.bulk_create([
+        CacheVersion(namespace=namespace, version=1)
+        for namespace in ('tags', 'ingredients')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0014_ingredient_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('namespace', models.CharField(max_length=50, unique=True, verbose_name='Раздел')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Версия')),
+            ],
+            options={
+                'verbose_name': 'Версия кэша',
+                'verbose_name_plural': 'Версии кэша',
+            },
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.5 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0015_cacheversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingredientrecipe',
+            index=models.Index(fields=['recipe', 'id'], name='ingredientrecipe_recipe_id_idx'),
+        ),
+    ]
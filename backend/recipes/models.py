@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -24,11 +25,63 @@ class Ingredient(models.Model):
     class Meta:
         verbose_name = 'Ингредиент'
         verbose_name_plural = 'Ингредиенты'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['name', 'measurement_unit'],
+                name='unique_ingredient'
+            )
+        ]
 
     def __str__(self):
         return self.name
 
 
+class RecipeQuerySet(models.QuerySet):
+
+    def with_related(self, user):
+        authors = User.objects.order_by()
+        if user.is_authenticated:
+            authors = authors.annotate(is_subscribed=models.Exists(
+                Subscribe.objects.filter(
+                    user=user, author=models.OuterRef('pk')
+                )
+            ))
+        return self.prefetch_related(
+            models.Prefetch('author', queryset=authors),
+            models.Prefetch('tags', queryset=Tag.objects.order_by('id')),
+            models.Prefetch(
+                'ingredientrecipe_set',
+                queryset=IngredientRecipe.objects.select_related(
+                    'ingredient'
+                ).order_by('id')
+            ),
+        )
+
+    def latest_by_author(self, author_ids, limit=None):
+        recipes = {author_id: [] for author_id in author_ids}
+        if not author_ids:
+            return recipes
+        placeholders = ', '.join(['%s'] * len(author_ids))
+        params = list(author_ids)
+        position_filter = ''
+        if limit is not None:
+            position_filter = 'WHERE position <= %s'
+            params.append(limit)
+        ranked = self.model._default_manager.raw(
+            'SELECT id, author_id, name, image, image_variants, cooking_time '
+            'FROM ('
+            'SELECT *, ROW_NUMBER() OVER ('
+            'PARTITION BY author_id ORDER BY pub_date DESC, id DESC'
+            f') AS position FROM {self.model._meta.db_table} '
+            f'WHERE author_id IN ({placeholders})'
+            f') ranked {position_filter} ORDER BY author_id, position',
+            params
+        )
+        for recipe in ranked:
+            recipes[recipe.author_id].append(recipe)
+        return recipes
+
+
 class Recipe(models.Model):
     author = models.ForeignKey(
         User,
@@ -53,22 +106,53 @@ class Recipe(models.Model):
         blank=True,
         null=True,
     )
+    image_variants = models.JSONField(
+        'Варианты изображения',
+        default=dict,
+        blank=True,
+        editable=False
+    )
     pub_date = models.DateTimeField(
         'Дата публикации',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
+    favorites_count = models.PositiveIntegerField(
+        'Добавлений в избранное',
+        default=0,
+        editable=False
+    )
     cooking_time = models.PositiveIntegerField(
         'Время приготовления'
     )
 
+    objects = RecipeQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='recipe_pub_date_id_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='recipe_author_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def touch(cls, recipe_ids):
+        cls.objects.filter(pk__in=recipe_ids).update(updated_at=timezone.now())
+
 
 class IngredientRecipe(models.Model):
     recipe = models.ForeignKey(
@@ -87,6 +171,11 @@ class IngredientRecipe(models.Model):
         verbose_name = 'Ингредиент рецепта'
         verbose_name_plural = 'Ингредиенты рецепта'
         unique_together = ('ingredient', 'recipe')
+        indexes = [
+            models.Index(
+                fields=['recipe', 'id'], name='ingredientrecipe_recipe_id_idx'
+            ),
+        ]
 
     def __str__(self):
         return (f'{self.ingredient.name} - {self.amount}'
@@ -116,6 +205,12 @@ class Subscribe(models.Model):
                 name='unique_subscription'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['author', 'user'],
+                name='subscribe_author_user_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.user} подписан на {self.author}'
@@ -142,6 +237,12 @@ class Favorite(models.Model):
                 name='unique_recipe'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['recipe', 'user'],
+                name='favorite_recipe_user_idx'
+            ),
+        ]
         verbose_name = 'Избранное'
         verbose_name_plural = 'Избранное'
 
@@ -170,6 +271,58 @@ class PurchaseList(models.Model):
     class Meta:
         verbose_name = 'Покупка'
         verbose_name_plural = 'Покупки'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'recipe'],
+                name='unique_purchase'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['recipe', 'user'],
+                name='purchase_recipe_user_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'Покупка: {self.recipe.name}'
+
+
+class ShoppingListItem(models.Model):
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE,
+        related_name='shopping_list'
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        verbose_name='Ингредиент',
+        on_delete=models.CASCADE
+    )
+    amount = models.IntegerField('Количество')
+
+    class Meta:
+        verbose_name = 'Позиция списка покупок'
+        verbose_name_plural = 'Список покупок'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'ingredient'],
+                name='unique_shopping_list_item'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.user}: {self.ingredient} - {self.amount}'
+
+
+class CacheVersion(models.Model):
+    namespace = models.CharField('Раздел', max_length=50, unique=True)
+    version = models.PositiveBigIntegerField('Версия', default=0)
+
+    class Meta:
+        verbose_name = 'Версия кэша'
+        verbose_name_plural = 'Версии кэша'
+
+    def __str__(self):
+        return f'{self.namespace}: {self.version}'
@@ -1,5 +1,116 @@
-from rest_framework.pagination import PageNumberPagination
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor, CursorPagination, PageNumberPagination
+)
 
 
 class PageNumberPaginatorModified(PageNumberPagination):
     page_size_query_param = 'limit'
+
+
+class RecipeCursorPagination(CursorPagination):
+    ordering = ('-pub_date', '-id')
+    page_size_query_param = 'limit'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        position = self.cursor and self.cursor.position
+        reverse = bool(self.cursor and self.cursor.reverse)
+        if position is not None:
+            pub_date, pk = self.parse_position(position)
+            lookup = 'gte' if reverse else 'lte'
+            strict = 'gt' if reverse else 'lt'
+            queryset = queryset.filter(
+                Q(**{f'pub_date__{strict}': pub_date})
+                | Q(**{f'id__{strict}': pk}),
+                **{f'pub_date__{lookup}': pub_date}
+            )
+        ordering = ('pub_date', 'id') if reverse else self.ordering
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.display_page_controls = self.has_next or self.has_previous
+        return self.page
+
+    def parse_position(self, position):
+        pub_date, _, pk = position.rpartition('|')
+        try:
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except ValueError:
+            pub_date = None
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, pk
+
+    def get_position(self, recipe):
+        if isinstance(recipe, dict):
+            return f'{recipe["pub_date"].isoformat()}|{recipe["id"]}'
+        return f'{recipe.pub_date.isoformat()}|{recipe.pk}'
+
+    def get_link(self, reverse, recipe):
+        position = (
+            self.get_position(recipe) if recipe is not None
+            else self.cursor.position
+        )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=reverse, position=position)
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.get_link(False, self.page[-1] if self.page else None)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.get_link(True, self.page[0] if self.page else None)
+
+    def get_count(self):
+        return None
+
+
+class RecipePaginator(PageNumberPaginatorModified):
+    cursor_pagination_class = RecipeCursorPagination
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = self.cursor_pagination_class()
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_previous_link()
+        return super().get_previous_link()
+
+    def get_count(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_count()
+        return self.page.paginator.count
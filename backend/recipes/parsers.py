@@ -0,0 +1,10 @@
+from rest_framework.parsers import BaseParser
+
+from .uploads import decode_base64, iter_stream
+
+
+class Base64ImageParser(BaseParser):
+    media_type = 'text/plain'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return {'image': decode_base64(iter_stream(stream))}
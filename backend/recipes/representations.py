@@ -0,0 +1,97 @@
+from collections import defaultdict
+
+from django.core.files.storage import default_storage
+
+from foodgram_api.metrics import serializer_timer
+
+from .images import build_variant_urls
+from .memberships import get_user_recipe_ids
+from .models import Favorite, IngredientRecipe, PurchaseList, Recipe
+
+AUTHOR_FIELDS = (
+    'author__email', 'author__username', 'author__first_name',
+    'author__last_name'
+)
+RECIPE_FIELDS = (
+    'id', 'author_id', 'name', 'image', 'image_variants', 'text',
+    'cooking_time', 'pub_date', 'updated_at'
+) + AUTHOR_FIELDS
+
+
+def get_tags(recipe_ids):
+    tags = defaultdict(list)
+    rows = Recipe.tags.through.objects.filter(
+        recipe_id__in=recipe_ids
+    ).values_list(
+        'recipe_id', 'tag_id', 'tag__name', 'tag__color', 'tag__slug'
+    ).order_by('recipe_id', 'tag_id')
+    for recipe_id, tag_id, name, color, slug in rows:
+        tags[recipe_id].append(
+            {'id': tag_id, 'name': name, 'color': color, 'slug': slug}
+        )
+    return tags
+
+
+def get_ingredients(recipe_ids):
+    ingredients = defaultdict(list)
+    rows = IngredientRecipe.objects.filter(
+        recipe_id__in=recipe_ids
+    ).values_list(
+        'recipe_id', 'ingredient_id', 'ingredient__name',
+        'ingredient__measurement_unit', 'amount'
+    ).order_by('recipe_id', 'id')
+    for recipe_id, ingredient_id, name, measurement_unit, amount in rows:
+        ingredients[recipe_id].append({
+            'id': ingredient_id,
+            'name': name,
+            'measurement_unit': measurement_unit,
+            'amount': amount,
+        })
+    return ingredients
+
+
+def get_author(recipe, followed):
+    return {
+        'email': recipe['author__email'],
+        'id': recipe['author_id'],
+        'username': recipe['author__username'],
+        'first_name': recipe['author__first_name'],
+        'last_name': recipe['author__last_name'],
+        'is_subscribed': recipe['author_id'] in followed,
+    }
+
+
+def get_image_url(image, request):
+    if not image:
+        return None
+    return request.build_absolute_uri(default_storage.url(image))
+
+
+def represent_recipes(recipes, request, followed):
+    with serializer_timer():
+        recipe_ids = [recipe['id'] for recipe in recipes]
+        if not recipe_ids:
+            return []
+        user = request.user
+        tags = get_tags(recipe_ids)
+        ingredients = get_ingredients(recipe_ids)
+        favorite_ids = get_user_recipe_ids(user, Favorite)
+        cart_ids = get_user_recipe_ids(user, PurchaseList)
+        return [
+            {
+                'id': recipe['id'],
+                'tags': tags[recipe['id']],
+                'author': get_author(recipe, followed),
+                'ingredients': ingredients[recipe['id']],
+                'is_favorited': recipe['id'] in favorite_ids,
+                'is_in_shopping_cart': recipe['id'] in cart_ids,
+                'name': recipe['name'],
+                'image': get_image_url(recipe['image'], request),
+                'image_variants': build_variant_urls(
+                    recipe['image'], recipe['image_variants'], request
+                ),
+                'text': recipe['text'],
+                'cooking_time': recipe['cooking_time'],
+            }
+            for recipe in recipes
+        ]
@@ -1,12 +1,13 @@
 from django.contrib.auth import get_user_model
-from django.db.models import F
-from drf_extra_fields.fields import Base64ImageField
+from django.db import transaction
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
-
 
+from foodgram_api.metrics import SerializerTimingMixin
 from users.serializers import UserSerializer
 
+from . import shopping_list
+from .fields import ImageVariantsField, StreamingImageField
+from .memberships import get_user_recipe_ids
 from .models import (
     Favorite, Ingredient, Recipe, IngredientRecipe, PurchaseList, Subscribe,
     Tag
@@ -16,14 +17,16 @@ from .models import (
 User = get_user_model()
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(SerializerTimingMixin,
+                    serializers.ModelSerializer):
 
     class Meta:
         model = Tag
         fields = '__all__'
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(SerializerTimingMixin,
+                           serializers.ModelSerializer):
 
     class Meta:
         model = Ingredient
@@ -51,42 +54,51 @@ class AddIngredientToRecipeSerializer(serializers.ModelSerializer):
         fields = ('id', 'amount')
 
 
-class RecipeListSerializer(serializers.ModelSerializer):
+class RecipeListSerializer(SerializerTimingMixin,
+                           serializers.ModelSerializer):
     author = UserSerializer()
     tags = TagSerializer(many=True)
     ingredients = serializers.SerializerMethodField()
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Recipe
         fields = (
             'id', 'tags', 'author', 'ingredients', 'is_favorited',
-            'is_in_shopping_cart', 'name', 'image', 'text', 'cooking_time'
+            'is_in_shopping_cart', 'name', 'image', 'image_variants', 'text',
+            'cooking_time'
         )
 
     def get_ingredients(self, obj):
-        qs = IngredientRecipe.objects.filter(recipe=obj)
-        return ShowRecipeIngredientSerializer(qs, many=True).data
+        return ShowRecipeIngredientSerializer(
+            obj.ingredientrecipe_set.all(), many=True
+        ).data
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user_recipe_ids = {}
 
     def get_is_favorited(self, obj):
-        request = self.context.get('request')
-        if not request or request.user.is_anonymous:
-            return False
-        return Favorite.objects.filter(user=request.user, recipe=obj).exists()
+        return obj.id in self.get_user_recipe_ids(Favorite)
 
     def get_is_in_shopping_cart(self, obj):
-        request = self.context.get('request')
-        if not request or request.user.is_anonymous:
-            return False
-        return PurchaseList.objects.filter(
-            user=request.user,
-            recipe=obj
-        ).exists()
+        return obj.id in self.get_user_recipe_ids(PurchaseList)
+
+    def get_user_recipe_ids(self, model):
+        if model not in self.user_recipe_ids:
+            request = self.context.get('request')
+            self.user_recipe_ids[model] = (
+                get_user_recipe_ids(request.user, model)
+                if request else frozenset()
+            )
+        return self.user_recipe_ids[model]
 
 
-class CreateRecipeSerializer(serializers.ModelSerializer):
-    image = Base64ImageField(max_length=None, use_url=True)
+class CreateRecipeSerializer(SerializerTimingMixin,
+                             serializers.ModelSerializer):
+    image = StreamingImageField(max_length=None, use_url=True)
     tags = serializers.PrimaryKeyRelatedField(
         many=True,
         queryset=Tag.objects.all()
@@ -98,59 +110,52 @@ class CreateRecipeSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('author',)
 
-    def create(self, validated_data):
-        ingredients = validated_data.pop('ingredients')
-        tags = validated_data.pop('tags')
-
+    def validate_ingredients(self, ingredients):
+        amounts = {}
         for ingredient in ingredients:
             if ingredient['amount'] < 0:
                 raise serializers.ValidationError(
                     'Количество ингредиента не может быть '
                     'отрицательным числом.'
                 )
+            amounts[ingredient['id']] = (
+                amounts.get(ingredient['id'], 0) + ingredient['amount']
+            )
+        found = Ingredient.objects.in_bulk(list(amounts))
+        missing = sorted(set(amounts) - set(found))
+        if missing:
+            raise serializers.ValidationError(
+                f'Ингредиенты не найдены: {missing}'
+            )
+        return [
+            {'ingredient': found[pk], 'amount': amount}
+            for pk, amount in amounts.items()
+        ]
+
+    @staticmethod
+    def save_ingredients(recipe, ingredients):
+        IngredientRecipe.objects.bulk_create(
+            IngredientRecipe(recipe=recipe, **ingredient)
+            for ingredient in ingredients
+        )
+
+    @transaction.atomic
+    def create(self, validated_data):
+        ingredients = validated_data.pop('ingredients')
+        tags = validated_data.pop('tags')
         recipe = Recipe.objects.create(**validated_data)
         recipe.tags.set(tags)
-        for ingredient in ingredients:
-            obj = get_object_or_404(Ingredient, id=ingredient['id'])
-            amount = ingredient['amount']
-            if IngredientRecipe.objects.filter(
-                    recipe=recipe,
-                    ingredient=obj
-            ).exists():
-                amount += F('amount')
-            IngredientRecipe.objects.update_or_create(
-                recipe=recipe,
-                ingredient=obj,
-                defaults={'amount': amount}
-            )
+        self.save_ingredients(recipe, ingredients)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        if 'ingredients' in self.initial_data:
+        if 'ingredients' in validated_data:
             ingredients = validated_data.pop('ingredients')
-
-            for ingredient in ingredients:
-                if ingredient['amount'] < 0:
-                    raise serializers.ValidationError(
-                        'Количество ингредиента не может быть '
-                        'отрицательным числом.'
-                    )
-            instance.ingredients.clear()
-            for ingredient in ingredients:
-                obj = get_object_or_404(Ingredient,
-                                        id=ingredient['id'])
-                amount = ingredient['amount']
-                if IngredientRecipe.objects.filter(
-                        recipe=instance,
-                        ingredient=obj
-                ).exists():
-                    amount += F('amount')
-                IngredientRecipe.objects.update_or_create(
-                    recipe=instance,
-                    ingredient=obj,
-                    defaults={'amount': amount}
-                )
-        if 'tags' in self.initial_data:
+            with shopping_list.recipe_change(instance):
+                instance.ingredients.clear()
+                self.save_ingredients(instance, ingredients)
+        if 'tags' in validated_data:
             tags = validated_data.pop('tags')
             instance.tags.set(tags)
 
@@ -165,75 +170,66 @@ class CreateRecipeSerializer(serializers.ModelSerializer):
         return instance
 
     def to_representation(self, instance):
+        request = self.context.get('request')
+        if request is not None:
+            instance = Recipe.objects.with_related(
+                request.user
+            ).get(pk=instance.pk)
         return RecipeListSerializer(
             instance,
-            context={'request': self.context.get('request')}
+            context={'request': request}
         ).data
 
-    def to_representation(self, instance):
-        return RecipeListSerializer(
-            instance,
-            context={'request': self.context.get('request')}
-        ).data
 
+class RecipeShortSerializer(SerializerTimingMixin,
+                            serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
 
-class RecipeShortSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recipe
-        fields = ['id', 'name', 'image', 'cooking_time']
+        fields = ['id', 'name', 'image', 'image_variants', 'cooking_time']
 
 
-class FavoriteSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Favorite
-        fields = '__all__'
+class RecipeImageSerializer(SerializerTimingMixin,
+                            serializers.ModelSerializer):
+    image = StreamingImageField(max_length=None, use_url=True)
 
-    def validate(self, attrs):
-        request = self.context['request']
-        if (request.method == 'GET'
-                and Favorite.objects.filter(
-                    user=request.user,
-                    recipe=attrs['recipe']
-                ).exists()):
-            raise serializers.ValidationError(
-                'Рецепт уже добавлен в избранное'
-            )
-        return attrs
+    class Meta:
+        model = Recipe
+        fields = ('image',)
 
     def to_representation(self, instance):
         return RecipeShortSerializer(
-            instance.recipe,
+            instance,
             context={'request': self.context.get('request')}
         ).data
 
 
-class PurchaseListSerializer(serializers.ModelSerializer):
-
-    class Meta:
-        model = PurchaseList
-        fields = '__all__'
+class BulkPurchaseListSerializer(serializers.Serializer):
+    add = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=100,
+        default=list
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=100,
+        default=list
+    )
 
     def validate(self, attrs):
-        request = self.context['request']
-        if (request.method == 'GET'
-                and PurchaseList.objects.filter(
-                    user=request.user,
-                    recipe=attrs['recipe'])):
+        if set(attrs['add']) & set(attrs['remove']):
             raise serializers.ValidationError(
-                'Вы уже добавили рецепт в список покупок'
+                'Рецепт нельзя одновременно добавить и удалить'
             )
+        if not attrs['add'] and not attrs['remove']:
+            raise serializers.ValidationError('Список рецептов пуст')
         return attrs
 
-    def to_representation(self, instance):
-        return RecipeShortSerializer(
-            instance.recipe,
-            context={'request': self.context.get('request')}
-        ).data
 
-
-class SubscribersSerializer(serializers.ModelSerializer):
-    recipes = RecipeShortSerializer(many=True, read_only=True)
-    recipes_count = serializers.SerializerMethodField()
+class SubscribersSerializer(SerializerTimingMixin,
+                            serializers.ModelSerializer):
+    recipes = serializers.SerializerMethodField()
     is_subscribed = serializers.SerializerMethodField()
 
     class Meta:
@@ -243,37 +239,32 @@ class SubscribersSerializer(serializers.ModelSerializer):
             'is_subscribed', 'recipes', 'recipes_count'
         )
 
-    def get_recipes_count(self, obj):
-        return obj.recipes.count()
+    @staticmethod
+    def get_recipes_limit(request):
+        if request is None:
+            return None
+        try:
+            limit = int(request.query_params['recipes_limit'])
+        except (KeyError, ValueError):
+            return None
+        return limit if limit >= 0 else None
+
+    def get_recipes(self, obj):
+        if hasattr(obj, 'latest_recipes'):
+            recipes = obj.latest_recipes
+        else:
+            recipes = obj.recipes.all()
+            limit = self.get_recipes_limit(self.context.get('request'))
+            if limit is not None:
+                recipes = recipes[:limit]
+        return RecipeShortSerializer(
+            recipes, many=True, context=self.context
+        ).data
 
     def get_is_subscribed(self, obj):
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
-        return Subscribe.objects.filter(user=obj, author=request.user).exists()
-
-
-class SubscribeSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Subscribe
-        fields = '__all__'
-
-    def validate(self, attrs):
-        request = self.context['request']
-        if request.method == 'GET':
-            if request.user == attrs['author']:
-                raise serializers.ValidationError(
-                    'Невозможно подписаться на себя'
-                )
-            if Subscribe.objects.filter(
-                    user=request.user,
-                    author=attrs['author']
-            ).exists():
-                raise serializers.ValidationError('Вы уже подписаны')
-        return attrs
-
-    def to_representation(self, instance):
-        return SubscribersSerializer(
-            instance.author,
-            context={'request': self.context.get('request')}
-        ).data
+        return Subscribe.objects.filter(user=request.user, author=obj).exists()
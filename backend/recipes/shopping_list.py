@@ -0,0 +1,152 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import islice
+
+from django.db import connection
+from django.db.models import Count, Sum
+
+from .models import IngredientRecipe, PurchaseList, ShoppingListItem
+
+ITEMS = ShoppingListItem._meta.db_table
+INGREDIENTS = IngredientRecipe._meta.db_table
+UPSERT = (
+    f'INSERT INTO {ITEMS} (user_id, ingredient_id, amount) {{}} '
+    'ON CONFLICT (user_id, ingredient_id) '
+    f'DO UPDATE SET amount = {ITEMS}.amount + EXCLUDED.amount'
+)
+BATCH_SIZE = 500
+
+local = threading.local()
+
+
+def get_untracked_recipe_ids():
+    if not hasattr(local, 'recipe_ids'):
+        local.recipe_ids = set()
+    return local.recipe_ids
+
+
+@contextmanager
+def untracked(recipe_id):
+    recipe_ids = get_untracked_recipe_ids()
+    recipe_ids.add(recipe_id)
+    try:
+        yield
+    finally:
+        recipe_ids.discard(recipe_id)
+
+
+def delete_empty(user_ids):
+    ShoppingListItem.objects.filter(
+        user_id__in=user_ids, amount__lte=0
+    ).delete()
+
+
+def change_recipes(user_id, recipe_ids, sign):
+    if not recipe_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(recipe_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPSERT.format(
+                f'SELECT %s, ingredient_id, %s * SUM(amount) '
+                f'FROM {INGREDIENTS} WHERE recipe_id IN ({placeholders}) '
+                'GROUP BY ingredient_id'
+            ),
+            [user_id, sign, *recipe_ids]
+        )
+    if sign < 0:
+        delete_empty([user_id])
+
+
+def add_recipes(user_id, recipe_ids):
+    change_recipes(user_id, recipe_ids, 1)
+
+
+def remove_recipes(user_id, recipe_ids):
+    change_recipes(user_id, recipe_ids, -1)
+
+
+def add_recipe(user_id, recipe_id):
+    add_recipes(user_id, [recipe_id])
+
+
+def remove_recipe(user_id, recipe_id):
+    remove_recipes(user_id, [recipe_id])
+
+
+def get_amounts(recipe):
+    return dict(
+        IngredientRecipe.objects.filter(recipe=recipe).values_list(
+            'ingredient_id', 'amount'
+        )
+    )
+
+
+def apply_recipe_change(recipe, old_amounts, new_amounts):
+    deltas = {
+        ingredient_id: new_amounts.get(ingredient_id, 0)
+        - old_amounts.get(ingredient_id, 0)
+        for ingredient_id in old_amounts.keys() | new_amounts.keys()
+    }
+    deltas = {key: value for key, value in deltas.items() if value}
+    if not deltas:
+        return
+    customers = dict(
+        PurchaseList.objects.filter(recipe=recipe).values(
+            'user'
+        ).annotate(times=Count('pk')).values_list('user', 'times')
+    )
+    rows = (
+        (user_id, ingredient_id, delta * times)
+        for user_id, times in customers.items()
+        for ingredient_id, delta in deltas.items()
+    )
+    with connection.cursor() as cursor:
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            cursor.execute(
+                UPSERT.format(
+                    'VALUES ' + ', '.join(['(%s, %s, %s)'] * len(batch))
+                ),
+                [value for row in batch for value in row]
+            )
+    delete_empty(customers)
+
+
+@contextmanager
+def recipe_change(recipe):
+    old_amounts = get_amounts(recipe)
+    with untracked(recipe.pk):
+        yield
+    apply_recipe_change(recipe, old_amounts, get_amounts(recipe))
+
+
+def apply_ingredient_change(old, new):
+    changes = defaultdict(lambda: ({}, {}))
+    untracked_recipe_ids = get_untracked_recipe_ids()
+    for index, state in enumerate((old, new)):
+        if state is not None and state[0] not in untracked_recipe_ids:
+            recipe_id, ingredient_id, amount = state
+            changes[recipe_id][index][ingredient_id] = amount
+    for recipe_id, (old_amounts, new_amounts) in changes.items():
+        apply_recipe_change(recipe_id, old_amounts, new_amounts)
+
+
+def rebuild():
+    ShoppingListItem.objects.all().delete()
+    totals = IngredientRecipe.objects.filter(
+        recipe__customers__isnull=False
+    ).values(
+        'recipe__customers__user', 'ingredient'
+    ).annotate(total=Sum('amount')).order_by()
+    return len(ShoppingListItem.objects.bulk_create(
+        (ShoppingListItem(
+            user_id=row['recipe__customers__user'],
+            ingredient_id=row['ingredient'],
+            amount=row['total']
+        ) for row in totals.iterator()),
+        batch_size=BATCH_SIZE
+    ))
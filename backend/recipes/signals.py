@@ -0,0 +1,157 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from .autocomplete import ingredient_index
+from .caching import bump_version
+from .counters import change_favorites_count, change_recipes_count
+from .feed import invalidate_followed_authors
+from .images import schedule_variants
+from .memberships import invalidate_recipe_ids
+from .models import (
+    Favorite, Ingredient, IngredientRecipe, PurchaseList, Recipe, Subscribe,
+    Tag
+)
+from .representations import AUTHOR_FIELDS
+from .shopping_list import (
+    add_recipe, apply_ingredient_change, get_untracked_recipe_ids, remove_recipe
+)
+
+User = get_user_model()
+
+AUTHOR_FIELD_NAMES = {field.split('__')[1] for field in AUTHOR_FIELDS}
+INGREDIENT_STATE = ('recipe_id', 'ingredient_id', 'amount')
+
+
+@receiver([post_save, post_delete], sender=Ingredient)
+def invalidate_ingredient_index(sender, **kwargs):
+    ingredient_index.invalidate()
+    bump_version('ingredients')
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_tags(sender, **kwargs):
+    bump_version('tags')
+
+
+@receiver([post_save, post_delete], sender=IngredientRecipe)
+def touch_recipe_ingredients(sender, instance, **kwargs):
+    Recipe.touch([instance.recipe_id])
+
+
+def get_ingredient_state(instance):
+    return tuple(getattr(instance, field) for field in INGREDIENT_STATE)
+
+
+@receiver(pre_save, sender=IngredientRecipe)
+def remember_ingredient_state(sender, instance, raw, **kwargs):
+    instance.previous_state = None
+    if instance.pk is not None and not raw:
+        instance.previous_state = IngredientRecipe.objects.filter(
+            pk=instance.pk
+        ).values_list(*INGREDIENT_STATE).first()
+
+
+@receiver(post_save, sender=IngredientRecipe)
+def update_shopping_lists(sender, instance, raw, **kwargs):
+    if not raw:
+        apply_ingredient_change(
+            instance.previous_state, get_ingredient_state(instance)
+        )
+
+
+@receiver(post_delete, sender=IngredientRecipe)
+def remove_from_shopping_lists(sender, instance, **kwargs):
+    apply_ingredient_change(get_ingredient_state(instance), None)
+
+
+@receiver(pre_delete, sender=Recipe)
+def untrack_deleted_recipe(sender, instance, **kwargs):
+    get_untracked_recipe_ids().add(instance.pk)
+
+
+@receiver(post_delete, sender=Recipe)
+def forget_deleted_recipe(sender, instance, **kwargs):
+    get_untracked_recipe_ids().discard(instance.pk)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def touch_recipe_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        Recipe.touch([instance.pk])
+    elif action == 'pre_clear':
+        Recipe.touch(instance.recipes.values('pk'))
+    else:
+        Recipe.touch(pk_set)
+
+
+@receiver(post_save, sender=User)
+def touch_author_recipes(sender, instance, created, raw, update_fields,
+                         **kwargs):
+    if created or raw:
+        return
+    if (update_fields is not None
+            and not AUTHOR_FIELD_NAMES.intersection(update_fields)):
+        return
+    Recipe.touch(instance.recipes.values('pk'))
+
+
+@receiver(post_save, sender=Favorite)
+def increment_favorites_count(sender, instance, created, **kwargs):
+    if created:
+        change_favorites_count(instance.recipe_id, 1)
+
+
+@receiver(post_delete, sender=Favorite)
+def decrement_favorites_count(sender, instance, **kwargs):
+    change_favorites_count(instance.recipe_id, -1)
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_save, sender=PurchaseList)
+def add_membership(sender, instance, created, **kwargs):
+    if created:
+        invalidate_recipe_ids(sender, instance.user_id)
+
+
+@receiver(post_delete, sender=Favorite)
+@receiver(post_delete, sender=PurchaseList)
+def remove_membership(sender, instance, **kwargs):
+    invalidate_recipe_ids(sender, instance.user_id)
+
+
+@receiver(post_save, sender=Recipe)
+def increment_recipes_count(sender, instance, created, **kwargs):
+    if created:
+        change_recipes_count(instance.author_id, 1)
+
+
+@receiver(post_save, sender=Recipe)
+def prepare_image_variants(sender, instance, raw, **kwargs):
+    if not raw:
+        schedule_variants(instance)
+
+
+@receiver(post_delete, sender=Recipe)
+def decrement_recipes_count(sender, instance, **kwargs):
+    change_recipes_count(instance.author_id, -1)
+
+
+@receiver(post_save, sender=PurchaseList)
+def add_to_shopping_list(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        add_recipe(instance.user_id, instance.recipe_id)
+
+
+@receiver(pre_delete, sender=PurchaseList)
+def remove_from_shopping_list(sender, instance, **kwargs):
+    remove_recipe(instance.user_id, instance.recipe_id)
+
+
+@receiver([post_save, post_delete], sender=Subscribe)
+def invalidate_subscriptions(sender, instance, **kwargs):
+    invalidate_followed_authors(instance.user_id)
@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.db.models import F
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from recipes.models import CacheVersion, Tag
+
+from .utils import clear_caches
+
+
+class VersionedCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Tag.objects.create(name='Завтрак', color='#E26C2D', slug='breakfast')
+
+    def setUp(self):
+        clear_caches()
+        self.client = APIClient()
+
+    def test_not_modified_for_current_etag(self):
+        etag = self.client.get('/api/tags/')['ETag']
+        response = self.client.get('/api/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_tag_change_updates_etag(self):
+        etag = self.client.get('/api/tags/')['ETag']
+        Tag.objects.create(name='Обед', color='#49B64E', slug='lunch')
+        response = self.client.get('/api/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_version_bumped_by_another_worker_updates_etag(self):
+        etag = self.client.get('/api/tags/')['ETag']
+        CacheVersion.objects.filter(namespace='tags').update(
+            version=F('version') + 1
+        )
+        response = self.client.get('/api/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @mock.patch('recipes.caching.is_shared_cache', return_value=True)
+    def test_shared_cache_repeat_loads_skip_database(self, is_shared_cache):
+        etag = self.client.get('/api/tags/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/tags/')
+        self.assertEqual(response.status_code, 200)
+        Tag.objects.create(name='Обед', color='#49B64E', slug='lunch')
+        response = self.client.get('/api/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from recipes.models import Recipe
+
+from .utils import clear_caches, create_recipes, create_user, token_client
+
+User = get_user_model()
+
+
+class AuthorConditionalGetTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user(0)
+        cls.reader = create_user(1)
+        _, _, recipes = create_recipes([cls.author], 2)
+        cls.recipe = recipes[0]
+        Recipe.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+    def setUp(self):
+        clear_caches()
+
+    def get_author(self, response):
+        data = response.json()
+        if 'results' in data:
+            data = data['results'][-1]
+        return data['author']
+
+    def test_author_change_updates_etag(self):
+        urls = ['/api/recipes/', f'/api/recipes/{self.recipe.pk}/']
+        for fast in (True, False):
+            for client in (APIClient(), token_client(self.reader)):
+                for url in urls:
+                    with self.subTest(fast=fast, url=url), override_settings(
+                        RECIPE_FAST_SERIALIZER=fast
+                    ):
+                        etag = client.get(url)['ETag']
+                        username = f'{self.author.username}_{fast}_{len(url)}'
+                        User.objects.filter(pk=self.author.pk).update(
+                            username=username
+                        )
+                        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                        self.assertEqual(response.status_code, 200)
+                        self.assertEqual(
+                            self.get_author(response)['username'], username
+                        )
+
+    def test_author_change_updates_last_modified(self):
+        url = f'/api/recipes/{self.recipe.pk}/'
+        last_modified = APIClient().get(url)['Last-Modified']
+        self.author.first_name = 'Другое имя'
+        self.author.save()
+        response = APIClient().get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['author']['first_name'], 'Другое имя'
+        )
+
+    def test_last_login_does_not_touch_recipes(self):
+        updated_at = Recipe.objects.get(pk=self.recipe.pk).updated_at
+        self.author.last_login = timezone.now()
+        self.author.save(update_fields=['last_login'])
+        self.assertEqual(
+            Recipe.objects.get(pk=self.recipe.pk).updated_at, updated_at
+        )
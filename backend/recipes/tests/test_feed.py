@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from recipes.feed import get_followed_author_ids, invalidate_followed_authors
+from recipes.models import Subscribe
+
+from .utils import clear_caches, create_user
+
+
+class FollowedAuthorsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(0)
+        cls.authors = [create_user(number) for number in range(1, 3)]
+        Subscribe.objects.create(user=cls.user, author=cls.authors[0])
+
+    def setUp(self):
+        clear_caches()
+
+    def subscribe_in_another_worker(self):
+        Subscribe.objects.bulk_create(
+            [Subscribe(user=self.user, author=self.authors[1])]
+        )
+
+    def test_local_cache_is_not_used(self):
+        self.assertEqual(
+            get_followed_author_ids(self.user.id), [self.authors[0].id]
+        )
+        self.subscribe_in_another_worker()
+        self.assertCountEqual(
+            get_followed_author_ids(self.user.id),
+            [author.id for author in self.authors]
+        )
+
+    @mock.patch('recipes.feed.is_shared_cache', return_value=True)
+    def test_shared_cache_is_used_until_invalidated(self, is_shared_cache):
+        get_followed_author_ids(self.user.id)
+        self.subscribe_in_another_worker()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_followed_author_ids(self.user.id), [self.authors[0].id]
+            )
+        invalidate_followed_authors(self.user.id)
+        self.assertCountEqual(
+            get_followed_author_ids(self.user.id),
+            [author.id for author in self.authors]
+        )
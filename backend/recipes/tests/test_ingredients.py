@@ -0,0 +1,49 @@
+from django.test import TestCase
+from django.urls import URLPattern
+from rest_framework.test import APIClient
+
+from recipes import urls
+from recipes.async_views import ingredient_list
+from recipes.models import Ingredient
+
+from .utils import clear_caches
+
+
+class IngredientRoutesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ingredient = Ingredient.objects.create(
+            name='Мука', measurement_unit='г'
+        )
+        Ingredient.objects.create(name='Молоко', measurement_unit='мл')
+
+    def setUp(self):
+        clear_caches()
+        self.client = APIClient()
+
+    def test_list_has_single_route(self):
+        patterns = [
+            pattern for pattern in urls.urlpatterns + urls.router.urls
+            if isinstance(pattern, URLPattern)
+            and pattern.pattern.match('ingredients/')
+        ]
+        self.assertEqual(len(patterns), 1)
+        self.assertIs(patterns[0].callback, ingredient_list)
+
+    def test_list(self):
+        response = self.client.get('/api/ingredients/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_search(self):
+        response = self.client.get('/api/ingredients/', {'name': 'мук'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [ingredient['name'] for ingredient in response.json()], ['Мука']
+        )
+
+    def test_detail(self):
+        response = self.client.get(f'/api/ingredients/{self.ingredient.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'Мука')
@@ -0,0 +1,123 @@
+import threading
+from unittest import mock
+
+from django.test import TestCase
+
+from recipes import memberships
+from recipes.models import Favorite
+
+from .utils import clear_caches, create_recipes, create_user
+
+
+class InterleavingCache:
+
+    def __init__(self, cache, before_get=None, before_set=None):
+        self.cache = cache
+        self.before_get = before_get
+        self.before_set = before_set
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+    def get(self, key, *args, **kwargs):
+        if self.before_get is not None:
+            self.before_get(key)
+        return self.cache.get(key, *args, **kwargs)
+
+    def set(self, key, *args, **kwargs):
+        if self.before_set is not None:
+            self.before_set(key)
+        return self.cache.set(key, *args, **kwargs)
+
+
+class LocalMembershipTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(0)
+        _, _, cls.recipes = create_recipes([cls.user], 2)
+        Favorite.objects.create(user=cls.user, recipe=cls.recipes[0])
+
+    def setUp(self):
+        clear_caches()
+
+    def test_local_cache_is_not_used(self):
+        self.assertEqual(
+            memberships.get_recipe_ids(Favorite, self.user.id),
+            {self.recipes[0].id}
+        )
+        Favorite.objects.bulk_create(
+            [Favorite(user=self.user, recipe=self.recipes[1])]
+        )
+        self.assertEqual(
+            memberships.get_recipe_ids(Favorite, self.user.id),
+            {recipe.id for recipe in self.recipes}
+        )
+
+
+@mock.patch('recipes.memberships.is_shared_cache', return_value=True)
+class MembershipCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(0)
+        _, _, cls.recipes = create_recipes([cls.user], 3)
+
+    def setUp(self):
+        clear_caches()
+        Favorite.objects.create(user=self.user, recipe=self.recipes[0])
+
+    def get_recipe_ids(self):
+        return memberships.get_recipe_ids(Favorite, self.user.id)
+
+    def add_favorite(self, recipe):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Favorite.objects.create(user=self.user, recipe=recipe)
+        return callbacks
+
+    def test_racing_writers_do_not_lose_updates(self, is_shared_cache):
+        self.get_recipe_ids()
+        callbacks = (
+            self.add_favorite(self.recipes[1])
+            + self.add_favorite(self.recipes[2])
+        )
+        barrier = threading.Barrier(len(callbacks), timeout=1)
+
+        def wait_for_other_writer(key):
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+
+        cache = InterleavingCache(
+            memberships.get_cache(), before_get=wait_for_other_writer
+        )
+        with mock.patch.object(memberships, 'get_cache', return_value=cache):
+            writers = [
+                threading.Thread(target=callback) for callback in callbacks
+            ]
+            for writer in writers:
+                writer.start()
+            for writer in writers:
+                writer.join()
+        self.assertEqual(
+            self.get_recipe_ids(), {recipe.id for recipe in self.recipes}
+        )
+
+    def test_fill_racing_with_writer_is_not_served(self, is_shared_cache):
+        writers = []
+
+        def commit_writer(key):
+            if not writers:
+                writers.extend(self.add_favorite(self.recipes[1]))
+                for callback in writers:
+                    callback()
+
+        cache = InterleavingCache(
+            memberships.get_cache(), before_set=commit_writer
+        )
+        with mock.patch.object(memberships, 'get_cache', return_value=cache):
+            self.assertEqual(self.get_recipe_ids(), {self.recipes[0].id})
+        self.assertEqual(
+            self.get_recipe_ids(), {self.recipes[0].id, self.recipes[1].id}
+        )
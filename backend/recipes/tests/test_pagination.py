@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from recipes.models import Recipe
+
+from .utils import clear_caches, create_recipes, create_user, token_client
+
+
+class RecipeCursorPaginationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(0)
+        cls.tags, _, recipes = create_recipes([cls.user], 12)
+        now = timezone.now()
+        Recipe.objects.filter(pk__in=[recipe.pk for recipe in recipes[:7]])\
+            .update(pub_date=now)
+        Recipe.objects.filter(pk__in=[recipe.pk for recipe in recipes[7:]])\
+            .update(pub_date=now - timezone.timedelta(hours=1))
+
+    def setUp(self):
+        clear_caches()
+        self.client = token_client(self.user)
+
+    def get_ids(self, params=None):
+        recipes = Recipe.objects.order_by('-pub_date', '-id')
+        if params and 'tags' in params:
+            recipes = recipes.filter(tags__slug=params['tags']).distinct()
+        return list(recipes.values_list('id', flat=True))
+
+    def walk(self, url, key):
+        pages = []
+        while url:
+            clear_caches()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            for query in queries:
+                self.assertNotIn('OFFSET', query['sql'].upper())
+            data = response.json()
+            pages.append([recipe['id'] for recipe in data['results']])
+            url = data[key]
+        return pages
+
+    def test_pages_are_keyed_on_pub_date_and_id(self):
+        for fast in (True, False):
+            for params in ({}, {'tags': 'tag-0'}):
+                with self.subTest(fast=fast, params=params), \
+                        override_settings(RECIPE_FAST_SERIALIZER=fast):
+                    query = '&'.join(
+                        f'{key}={value}' for key, value in params.items()
+                    )
+                    pages = self.walk(
+                        f'/api/recipes/?cursor=&limit=3&{query}', 'next'
+                    )
+                    self.assertEqual(sum(pages, []), self.get_ids(params))
+                    self.assertTrue(all(len(page) <= 3 for page in pages))
+
+    def test_previous_links_walk_back(self):
+        forward = []
+        url = '/api/recipes/?cursor=&limit=5'
+        while url:
+            data = self.client.get(url).json()
+            forward.append([recipe['id'] for recipe in data['results']])
+            last, url = data, data['next']
+        backward = self.walk(last['previous'], 'previous')
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/recipes/?cursor=cD1iYWQ%3D')
+        self.assertEqual(response.status_code, 404)
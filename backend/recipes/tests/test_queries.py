@@ -0,0 +1,82 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from recipes.models import Favorite, PurchaseList, Subscribe
+
+from .utils import clear_caches, create_recipes, create_user, token_client
+
+
+class RecipeListQueriesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(0)
+        authors = [cls.user, create_user(1), create_user(2)]
+        _, _, recipes = create_recipes(authors, 20)
+        for recipe in recipes[::2]:
+            Favorite.objects.create(user=cls.user, recipe=recipe)
+        for recipe in recipes[::3]:
+            PurchaseList.objects.create(user=cls.user, recipe=recipe)
+        Subscribe.objects.create(user=cls.user, author=authors[1])
+
+    def count_queries(self, client, limit):
+        clear_caches()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/recipes/', {'limit': limit})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), limit)
+        return len(queries)
+
+    def assert_constant_queries(self, client):
+        small = self.count_queries(client, 2)
+        clear_caches()
+        with self.assertNumQueries(small):
+            response = client.get('/api/recipes/', {'limit': 20})
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_authenticated_list_queries_do_not_grow_with_page_size(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(
+                RECIPE_FAST_SERIALIZER=fast
+            ):
+                self.assert_constant_queries(token_client(self.user))
+
+    def test_anonymous_list_queries_do_not_grow_with_page_size(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(
+                RECIPE_FAST_SERIALIZER=fast
+            ):
+                self.assert_constant_queries(APIClient())
+
+    def test_flags_match_database(self):
+        response = token_client(self.user).get(
+            '/api/recipes/', {'limit': 20}
+        )
+        favorites = set(Favorite.objects.filter(
+            user=self.user
+        ).values_list('recipe_id', flat=True))
+        cart = set(PurchaseList.objects.filter(
+            user=self.user
+        ).values_list('recipe_id', flat=True))
+        for recipe in response.data['results']:
+            self.assertEqual(recipe['is_favorited'], recipe['id'] in favorites)
+            self.assertEqual(
+                recipe['is_in_shopping_cart'], recipe['id'] in cart
+            )
+
+    def test_followed_authors_are_loaded_once_per_request(self):
+        client = token_client(self.user)
+        for url in ('/api/recipes/', '/api/recipes/feed/'):
+            with self.subTest(url=url), override_settings(
+                RECIPE_FAST_SERIALIZER=True
+            ):
+                clear_caches()
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len([
+                    query for query in queries
+                    if 'FROM "recipes_subscribe"' in query['sql']
+                ]), 1)
@@ -0,0 +1,115 @@
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import (
+    Favorite, IngredientRecipe, PurchaseList, Recipe, Subscribe
+)
+
+from .utils import clear_caches, create_recipes, create_user, token_client
+
+HOT_MODELS = (
+    Recipe, Recipe.tags.through, IngredientRecipe, Favorite, PurchaseList,
+    Subscribe
+)
+POSTGRES_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+POSTGRES_SORT = re.compile(r'^\s*(->\s*)?(Incremental )?Sort\b')
+SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+SQLITE_SORT = re.compile(r'USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)')
+
+
+@skipUnless(
+    connection.vendor in ('postgresql', 'sqlite'),
+    'Планы запросов проверяются только для PostgreSQL и SQLite'
+)
+class QueryPlansTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [create_user(number) for number in range(10)]
+        cls.tags, _, recipes = create_recipes(
+            cls.users, 60, ingredients_count=20
+        )
+        cls.recipe = recipes[-1]
+        for number, user in enumerate(cls.users):
+            for recipe in recipes[number::7]:
+                Favorite.objects.create(user=user, recipe=recipe)
+            for recipe in recipes[number::11]:
+                PurchaseList.objects.create(user=user, recipe=recipe)
+            for author in cls.users[number + 1:number + 4]:
+                Subscribe.objects.create(user=user, author=author)
+
+    def setUp(self):
+        clear_caches()
+        self.client = token_client(self.users[0])
+        self.hot_tables = {model._meta.db_table for model in HOT_MODELS}
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute('SET LOCAL enable_sort = off')
+
+    def get_cases(self):
+        next_page = self.client.get(
+            '/api/recipes/?cursor=&limit=6'
+        ).json()['next']
+        return [
+            ('Лента рецептов', '/api/recipes/', False),
+            ('Лента по курсору', '/api/recipes/?cursor=&limit=6', False),
+            ('Лента по курсору, следующая страница', next_page, False),
+            ('Рецепты автора',
+             f'/api/recipes/?author={self.recipe.author_id}', False),
+            ('Рецепты по тегу', f'/api/recipes/?tags={self.tags[0].slug}',
+             False),
+            ('Избранное', '/api/recipes/?is_favorited=1', False),
+            ('Список покупок', '/api/recipes/?is_in_shopping_cart=1', False),
+            ('Рецепт', f'/api/recipes/{self.recipe.pk}/', False),
+            ('Подписки', '/api/users/subscriptions/?recipes_limit=3', True),
+            ('Скачивание списка', '/api/recipes/download_shopping_cart/',
+             True),
+        ]
+
+    def test_hot_tables_use_indexes(self):
+        for name, url, sort_allowed in self.get_cases():
+            with self.subTest(name=name):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                self.assertEqual(response.status_code, 200)
+                problems = [
+                    f'{problem}\n  {query["sql"]}'
+                    for query in queries
+                    if query['sql'].lstrip().upper().startswith(
+                        ('SELECT', 'WITH')
+                    )
+                    for problem in self.find_problems(
+                        self.explain(query['sql']), sort_allowed
+                    )
+                ]
+                self.assertEqual(problems, [])
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'EXPLAIN {sql}')
+                return '\n'.join(row[0] for row in cursor.fetchall())
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return '\n'.join(row[-1] for row in cursor.fetchall())
+
+    def find_problems(self, plan, sort_allowed):
+        if connection.vendor == 'postgresql':
+            scan_pattern, sort_pattern = POSTGRES_SEQ_SCAN, POSTGRES_SORT
+            search = re.search
+        else:
+            scan_pattern, sort_pattern = SQLITE_SCAN, SQLITE_SORT
+            search = re.match
+        for line in plan.splitlines():
+            line = line.strip() if connection.vendor == 'sqlite' else line
+            scan = search(scan_pattern, line)
+            if scan and scan.group(1) in self.hot_tables:
+                yield f'полное сканирование {scan.group(1)}'
+            elif not sort_allowed and sort_pattern.search(line):
+                yield f'сортировка: {line.strip()}'
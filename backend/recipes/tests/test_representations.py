@@ -0,0 +1,133 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from recipes.models import (
+    Favorite, Ingredient, IngredientRecipe, PurchaseList, Recipe, Subscribe,
+    Tag
+)
+
+from .utils import clear_caches, token_client
+
+User = get_user_model()
+
+SPECIAL_TEXT = (
+    'Кавычки " и \\ слеш, перевод\nстроки, таб\t, \x01, '
+    'разделители   и  , эмодзи 🍲'
+)
+
+
+class RecipeRepresentationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create(
+                username=f'user_{number}',
+                email=f'user_{number}@example.com',
+                first_name=f'Имя "{number}"',
+                last_name='Фамилия  '
+            )
+            for number in range(3)
+        ]
+        cls.tags = [
+            Tag.objects.create(
+                name=f'Тег {number}  ', color='#E26C2D',
+                slug=f'tag-{number}'
+            )
+            for number in range(3)
+        ]
+        ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент "{number}"', measurement_unit='ст. л.'
+            )
+            for number in range(6)
+        ]
+        cls.recipes = []
+        for number in range(9):
+            recipe = Recipe.objects.create(
+                author=cls.users[number % len(cls.users)],
+                name=f'Рецепт {number} \\ "',
+                text=SPECIAL_TEXT,
+                cooking_time=number + 1,
+                image=f'recipes/images/{number}.jpg' if number % 3 else ''
+            )
+            if number % 3 == 1:
+                Recipe.objects.filter(pk=recipe.pk).update(image_variants={
+                    'source': recipe.image.name,
+                    'small': f'recipes/images/variants/{number}_small.webp',
+                })
+            for tag in reversed(cls.tags[number % 3:]):
+                recipe.tags.add(tag)
+            IngredientRecipe.objects.bulk_create(
+                IngredientRecipe(recipe=recipe, ingredient=ingredient,
+                                 amount=number * 10 + 1)
+                for ingredient in ingredients[number % 2::2]
+            )
+            cls.recipes.append(recipe)
+        user = cls.users[0]
+        Favorite.objects.create(user=user, recipe=cls.recipes[1])
+        Favorite.objects.create(user=user, recipe=cls.recipes[4])
+        PurchaseList.objects.create(user=user, recipe=cls.recipes[4])
+        PurchaseList.objects.create(user=user, recipe=cls.recipes[7])
+        Subscribe.objects.create(user=user, author=cls.users[1])
+
+    def setUp(self):
+        clear_caches()
+
+    def get_urls(self):
+        urls = [
+            '/api/recipes/',
+            '/api/recipes/?page=2&limit=4',
+            '/api/recipes/?cursor=&limit=4',
+            f'/api/recipes/?tags={self.tags[0].slug}'
+            f'&tags={self.tags[2].slug}',
+            f'/api/recipes/?author={self.users[1].pk}',
+            '/api/recipes/?is_favorited=1',
+            '/api/recipes/?is_in_shopping_cart=1',
+            '/api/recipes/?search=Рецепт',
+            '/api/recipes/feed/',
+            '/api/recipes/0/',
+        ]
+        urls.extend(f'/api/recipes/{recipe.pk}/' for recipe in self.recipes)
+        return urls
+
+    def test_fast_path_matches_serializers(self):
+        for client in (APIClient(), token_client(self.users[0])):
+            for url in self.get_urls():
+                with self.subTest(url=url):
+                    with override_settings(RECIPE_FAST_SERIALIZER=False):
+                        expected = client.get(url)
+                    with override_settings(RECIPE_FAST_SERIALIZER=True):
+                        actual = client.get(url)
+                    self.assertEqual(
+                        actual.status_code, expected.status_code
+                    )
+                    if expected.status_code == 200:
+                        self.assertEqual(
+                            actual.content,
+                            JSONRenderer().render(expected.data)
+                        )
+                    self.assertEqual(
+                        actual.get('ETag'), expected.get('ETag')
+                    )
+
+    def test_tags_and_ingredients_are_ordered(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(
+                RECIPE_FAST_SERIALIZER=fast
+            ):
+                response = APIClient().get(
+                    f'/api/recipes/{self.recipes[0].pk}/'
+                )
+                recipe = response.json()
+                self.assertEqual(
+                    [tag['id'] for tag in recipe['tags']],
+                    [tag.id for tag in self.tags]
+                )
+                self.assertEqual(
+                    [ingredient['name'] for ingredient in
+                     recipe['ingredients']],
+                    [f'Ингредиент "{number}"' for number in (0, 2, 4)]
+                )
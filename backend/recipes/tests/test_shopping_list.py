@@ -0,0 +1,202 @@
+from django.test import TestCase
+
+from recipes import shopping_list
+from recipes.models import (
+    Ingredient, IngredientRecipe, PurchaseList, Recipe, ShoppingListItem, Tag
+)
+
+from .utils import clear_caches, create_recipes, create_user, token_client
+
+
+class ShoppingListDownloadTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(0)
+        _, _, recipes = create_recipes([cls.user], 2)
+        for recipe in recipes:
+            PurchaseList.objects.create(user=cls.user, recipe=recipe)
+
+    def setUp(self):
+        clear_caches()
+        self.client = token_client(self.user)
+
+    def download(self, **params):
+        return self.client.get(
+            '/api/recipes/download_shopping_cart/', params
+        )
+
+    def test_text_is_streamed(self):
+        response = self.download(format='txt')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="shopping_list.txt"'
+        )
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'Ингредиент 0 (г) — 1 ')
+        self.assertEqual(lines[1], 'Ингредиент 1 (г) — 2 ')
+        self.assertEqual(lines[-1], 'FoodGram, 2021')
+
+    def test_csv_is_streamed(self):
+        response = self.download(format='csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content)
+        self.assertTrue(content.startswith('﻿'.encode()))
+        self.assertEqual(content.decode('utf-8-sig').splitlines(), [
+            'Ингредиент,Количество,Единица измерения',
+            'Ингредиент 0,1,г',
+            'Ингредиент 1,2,г',
+            'Ингредиент 2,1,г',
+            'Ингредиент 3,2,г',
+            'Ингредиент 4,1,г',
+            'Ингредиент 5,2,г',
+        ])
+
+    def test_pdf_is_streamed_from_file(self):
+        response = self.download(format='pdf')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(response.streaming_content).startswith(
+            b'%PDF'
+        ))
+
+    def test_format_negotiation(self):
+        cases = [
+            (None, 'application/pdf'),
+            ('*/*', 'application/pdf'),
+            ('application/json, text/plain, */*', 'application/pdf'),
+            ('text/html,application/xhtml+xml,*/*;q=0.8', 'application/pdf'),
+            ('text/plain', 'text/plain; charset=utf-8'),
+            ('text/csv, */*;q=0.8', 'text/csv; charset=utf-8'),
+            ('text/*', 'text/csv; charset=utf-8'),
+            ('text/csv;q=0.5, text/plain', 'text/plain; charset=utf-8'),
+            ('application/pdf;q=0, */*', 'text/csv; charset=utf-8'),
+        ]
+        for accept, content_type in cases:
+            with self.subTest(accept=accept):
+                headers = {} if accept is None else {'HTTP_ACCEPT': accept}
+                response = self.client.get(
+                    '/api/recipes/download_shopping_cart/', **headers
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Type'], content_type)
+
+    def test_unsupported_accept_is_not_acceptable(self):
+        response = self.client.get(
+            '/api/recipes/download_shopping_cart/',
+            HTTP_ACCEPT='application/json'
+        )
+        self.assertEqual(response.status_code, 406)
+
+    def test_format_parameter_overrides_accept(self):
+        response = self.download(format='txt')
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        response = self.download(format='xls')
+        self.assertEqual(response.status_code, 404)
+
+
+class ShoppingListMaintenanceTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(0)
+        cls.other = create_user(1)
+        cls.flour = Ingredient.objects.create(name='Мука', measurement_unit='г')
+        cls.milk = Ingredient.objects.create(
+            name='Молоко', measurement_unit='мл'
+        )
+
+    def setUp(self):
+        clear_caches()
+        self.first = self.create_recipe('Блины', {self.flour: 5})
+        self.second = self.create_recipe(
+            'Оладьи', {self.flour: 10, self.milk: 200}
+        )
+        for user in (self.user, self.other):
+            PurchaseList.objects.create(user=user, recipe=self.first)
+            PurchaseList.objects.create(user=user, recipe=self.second)
+
+    def create_recipe(self, name, amounts):
+        recipe = Recipe.objects.create(
+            author=self.user, name=name, text='Описание', cooking_time=10
+        )
+        for ingredient, amount in amounts.items():
+            IngredientRecipe.objects.create(
+                recipe=recipe, ingredient=ingredient, amount=amount
+            )
+        return recipe
+
+    def get_items(self, user=None):
+        return dict(ShoppingListItem.objects.filter(
+            user=user or self.user
+        ).values_list('ingredient__name', 'amount'))
+
+    def assert_matches_rebuild(self):
+        items = {user: self.get_items(user) for user in (self.user, self.other)}
+        shopping_list.rebuild()
+        self.assertEqual(
+            items,
+            {user: self.get_items(user) for user in (self.user, self.other)}
+        )
+
+    def test_ingredient_amount_change_updates_lists(self):
+        self.assertEqual(self.get_items(), {'Мука': 15, 'Молоко': 200})
+        item = IngredientRecipe.objects.get(
+            recipe=self.first, ingredient=self.flour
+        )
+        item.amount = 100
+        item.save()
+        self.assertEqual(self.get_items(), {'Мука': 110, 'Молоко': 200})
+        PurchaseList.objects.get(user=self.user, recipe=self.first).delete()
+        self.assertEqual(self.get_items(), {'Мука': 10, 'Молоко': 200})
+        self.assert_matches_rebuild()
+
+    def test_ingredient_swap_and_delete_update_lists(self):
+        item = IngredientRecipe.objects.get(
+            recipe=self.second, ingredient=self.milk
+        )
+        item.ingredient = Ingredient.objects.create(
+            name='Кефир', measurement_unit='мл'
+        )
+        item.save()
+        self.assertEqual(
+            self.get_items(), {'Мука': 15, 'Кефир': 200}
+        )
+        IngredientRecipe.objects.filter(
+            recipe=self.first, ingredient=self.flour
+        ).delete()
+        self.assertEqual(self.get_items(), {'Мука': 10, 'Кефир': 200})
+        self.assert_matches_rebuild()
+
+    def test_recipe_delete_subtracts_once(self):
+        self.first.delete()
+        self.assertEqual(self.get_items(), {'Мука': 10, 'Молоко': 200})
+        self.assert_matches_rebuild()
+
+    def test_recipe_update_applies_one_delta(self):
+        tag = Tag.objects.create(name='Завтрак', color='#E26C2D', slug='tag')
+        self.first.tags.set([tag])
+        response = token_client(self.user).patch(
+            f'/api/recipes/{self.first.pk}/',
+            {
+                'ingredients': [
+                    {'id': self.flour.pk, 'amount': 7},
+                    {'id': self.milk.pk, 'amount': 50},
+                ],
+                'tags': [tag.pk],
+                'name': 'Блины',
+                'text': 'Описание',
+                'cooking_time': 10,
+            },
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_items(), {'Мука': 17, 'Молоко': 250})
+        self.assertEqual(
+            self.get_items(self.other), {'Мука': 17, 'Молоко': 250}
+        )
+        self.assert_matches_rebuild()
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from recipes.models import Ingredient, IngredientRecipe, Recipe, Tag
+
+User = get_user_model()
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def create_user(number):
+    return User.objects.create_user(
+        username=f'user_{number}',
+        email=f'user_{number}@example.com',
+        password='password',
+        first_name='Имя',
+        last_name='Фамилия'
+    )
+
+
+def create_recipes(authors, count, tags_count=3, ingredients_count=6):
+    tags = [
+        Tag.objects.create(
+            name=f'Тег {number}', color='#E26C2D', slug=f'tag-{number}'
+        )
+        for number in range(tags_count)
+    ]
+    ingredients = [
+        Ingredient.objects.create(
+            name=f'Ингредиент {number}', measurement_unit='г'
+        )
+        for number in range(ingredients_count)
+    ]
+    recipes = []
+    for number in range(count):
+        recipe = Recipe.objects.create(
+            author=authors[number % len(authors)],
+            name=f'Рецепт {number}',
+            text='Описание',
+            cooking_time=number + 1
+        )
+        recipe.tags.set(tags[number % tags_count:])
+        IngredientRecipe.objects.bulk_create(
+            IngredientRecipe(
+                recipe=recipe, ingredient=ingredient, amount=number + 1
+            )
+            for ingredient in ingredients[number % 2::2]
+        )
+        recipes.append(recipe)
+    return tags, ingredients, recipes
+
+
+def token_client(user):
+    token, _ = Token.objects.get_or_create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
@@ -0,0 +1,56 @@
+from django.db import connection
+
+
+def get_columns(model, field_name):
+    quote = connection.ops.quote_name
+    field = model._meta.get_field(field_name)
+    return (
+        quote(model._meta.db_table),
+        quote(model._meta.get_field('user').column),
+        quote(field.column),
+        field.related_model,
+    )
+
+
+def add_links(model, user_id, field_name, target_ids, exclude=(),
+              **values):
+    if not target_ids:
+        return []
+    quote = connection.ops.quote_name
+    table, user_column, column, target = get_columns(model, field_name)
+    pk = quote(target._meta.pk.column)
+    fields = [model._meta.get_field(name) for name in values]
+    columns = [user_column, column, *(quote(field.column) for field in fields)]
+    sql = (
+        f'INSERT INTO {table} ({", ".join(columns)}) '
+        f'SELECT %s, {pk}{", %s" * len(values)} '
+        f'FROM {quote(target._meta.db_table)} '
+        f'WHERE {pk} IN ({", ".join(["%s"] * len(target_ids))})'
+    )
+    params = [
+        user_id,
+        *(field.get_db_prep_value(value, connection)
+          for field, value in zip(fields, values.values())),
+        *target_ids
+    ]
+    if exclude:
+        sql += f' AND {pk} NOT IN ({", ".join(["%s"] * len(exclude))})'
+        params.extend(exclude)
+    sql += f' ON CONFLICT DO NOTHING RETURNING {column}'
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def remove_links(model, user_id, field_name, target_ids):
+    if not target_ids:
+        return []
+    table, user_column, column, _ = get_columns(model, field_name)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE {user_column} = %s '
+            f'AND {column} IN ({", ".join(["%s"] * len(target_ids))}) '
+            f'RETURNING {column}',
+            [user_id, *target_ids]
+        )
+        return [row[0] for row in cursor.fetchall()]
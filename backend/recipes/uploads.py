@@ -0,0 +1,89 @@
+import base64
+import binascii
+import re
+import tempfile
+import uuid
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = re.compile(rb'\s+')
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': 'webp'}
+
+
+def size_error():
+    limit = settings.RECIPE_IMAGE_MAX_SIZE // (1024 * 1024)
+    return ValidationError(f'Размер изображения превышает {limit} МБ.')
+
+
+def decode_base64(chunks, max_size=None):
+    max_size = max_size or settings.RECIPE_IMAGE_MAX_SIZE
+    file = UploadedFile(
+        tempfile.TemporaryFile(dir=settings.FILE_UPLOAD_TEMP_DIR),
+        'image', 'application/octet-stream'
+    )
+    remainder = b''
+    size = 0
+    first = True
+    try:
+        for chunk in chunks:
+            chunk = remainder + WHITESPACE.sub(b'', chunk)
+            if first and chunk:
+                if chunk.startswith(b'data:'):
+                    chunk = chunk.partition(b',')[2]
+                first = False
+            usable = len(chunk) - len(chunk) % 4
+            decoded = base64.b64decode(chunk[:usable], validate=True)
+            remainder = chunk[usable:]
+            size += len(decoded)
+            if size > max_size:
+                raise size_error()
+            file.write(decoded)
+        if remainder or not size:
+            raise ValidationError('Некорректное изображение в base64.')
+    except binascii.Error:
+        file.close()
+        raise ValidationError('Некорректное изображение в base64.')
+    except ValidationError:
+        file.close()
+        raise
+    file.size = size
+    file.seek(0)
+    return file
+
+
+def iter_string(data):
+    for start in range(0, len(data), CHUNK_SIZE):
+        yield data[start:start + CHUNK_SIZE].encode('ascii', 'replace')
+
+
+def iter_stream(stream):
+    return iter(lambda: stream.read(CHUNK_SIZE), b'')
+
+
+def validate_image(file):
+    if file.size > settings.RECIPE_IMAGE_MAX_SIZE:
+        raise size_error()
+    file.seek(0)
+    try:
+        with Image.open(file) as image:
+            width, height = image.size
+            if width * height > settings.RECIPE_IMAGE_MAX_PIXELS:
+                raise ValidationError(
+                    'Слишком большое разрешение изображения.'
+                )
+            image_format = image.format
+            image.verify()
+    except ValidationError:
+        raise
+    except Exception:
+        raise ValidationError('Загрузите корректное изображение.')
+    if image_format not in EXTENSIONS:
+        raise ValidationError('Неподдерживаемый формат изображения.')
+    file.seek(0)
+    file.name = f'{uuid.uuid4()}.{EXTENSIONS[image_format]}'
+    file.content_type = Image.MIME[image_format]
+    return file
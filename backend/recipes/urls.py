@@ -1,15 +1,15 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (DownloadPurchaseList, FavoriteViewSet, IngredientViewSet,
-                    PurchaseListView, RecipeViewSet, SubscribeView,
-                    TagViewSet, show_subscribs)
+from .async_views import download_shopping_cart, ingredient_list, recipe_image
+from .views import (BulkPurchaseListView, FavoriteViewSet, IngredientViewSet,
+                    PurchaseListView, RecipeViewSet, SubscribeView, TagViewSet,
+                    show_subscribs)
 
 router = DefaultRouter()
 
 router.register('tags', TagViewSet, basename='tags')
 router.register('recipes', RecipeViewSet, basename='recipes')
-router.register('ingredients', IngredientViewSet, basename='ingredients')
 
 urlpatterns = [
     path('users/subscriptions/',
@@ -20,7 +20,15 @@ urlpatterns = [
          FavoriteViewSet.as_view(), name='add_recipe_to_favorite'),
     path('recipes/<int:recipe_id>/shopping_cart/',
          PurchaseListView.as_view(), name='add_recipe_to_shopping_cart'),
+    path('recipes/<int:recipe_id>/image/',
+         recipe_image, name='recipe_image'),
+    path('recipes/shopping_cart/',
+         BulkPurchaseListView.as_view(), name='bulk_shopping_cart'),
     path('recipes/download_shopping_cart/',
-         DownloadPurchaseList.as_view(), name='dowload_shopping_cart'),
+         download_shopping_cart, name='dowload_shopping_cart'),
+    path('ingredients/', ingredient_list, name='ingredients-list'),
+    path('ingredients/<int:pk>/',
+         IngredientViewSet.as_view({'get': 'retrieve'}),
+         name='ingredients-detail'),
     path('', include(router.urls))
 ]
@@ -1,30 +1,49 @@
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.http import HttpResponse
+from django.db import transaction
+from django.db.models import BooleanField, Value
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status, viewsets
-from rest_framework.decorators import api_view
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from .filters import RecipeFilter, SearchFilter
+from . import shopping_list
+from .caching import VersionedCacheMixin
+from .conditional import (
+    conditional_response, get_recipe_list_validators, get_recipe_validators
+)
+from .counters import change_favorites_count
+from .feed import get_user_followed_author_ids, invalidate_followed_authors
+from .filters import IngredientSearchFilter, RecipeFilter
+from .memberships import invalidate_recipe_ids
 from .models import (
     Favorite, Ingredient, PurchaseList, Recipe, Subscribe, Tag
 )
-from .paginators import PageNumberPaginatorModified
+from .paginators import (
+    PageNumberPaginatorModified, RecipeCursorPagination, RecipePaginator
+)
 from .permissions import AuthorOrReadOnly
+from .renderers import FastJSONRenderer
+from .representations import RECIPE_FIELDS, represent_recipes
 from .serializers import (
-    FavoriteSerializer, CreateRecipeSerializer, IngredientSerializer,
-    SubscribeSerializer, SubscribersSerializer, PurchaseListSerializer,
-    TagSerializer, RecipeListSerializer
+    BulkPurchaseListSerializer, CreateRecipeSerializer, IngredientSerializer,
+    SubscribersSerializer, RecipeShortSerializer, TagSerializer,
+    RecipeListSerializer
 )
+from .toggles import add_links, remove_links
 
 User = get_user_model()
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(VersionedCacheMixin, viewsets.ReadOnlyModelViewSet):
+    cache_namespace = 'tags'
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = (AllowAny,)
@@ -36,88 +55,165 @@ class RecipeViewSet(viewsets.ModelViewSet):
     permission_classes = [AuthorOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filter_class = RecipeFilter
-    pagination_class = PageNumberPaginatorModified
+    pagination_class = RecipePaginator
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if (self.action in ['list', 'retrieve', 'feed']
+                and not settings.RECIPE_FAST_SERIALIZER):
+            return queryset.with_related(self.request.user)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        return self.paginated_response(
+            request, self.filter_queryset(self.get_queryset()),
+            get_user_followed_author_ids(request.user)
+        )
+
+    @action(detail=False, permission_classes=[IsAuthenticated],
+            pagination_class=RecipeCursorPagination)
+    def feed(self, request):
+        followed = get_user_followed_author_ids(request.user)
+        return self.paginated_response(
+            request,
+            self.filter_queryset(self.get_queryset()).filter(
+                author_id__in=followed
+            ),
+            followed
+        )
+
+    def paginated_response(self, request, queryset, followed):
+        if settings.RECIPE_FAST_SERIALIZER:
+            queryset = queryset.values(*RECIPE_FIELDS)
+        page = self.paginate_queryset(queryset)
+        return conditional_response(
+            request,
+            get_recipe_list_validators(
+                request, page, self.paginator, followed
+            ),
+            lambda: self.get_paginated_response(
+                self.represent_page(page, followed)
+            )
+        )
+
+    def represent_page(self, page, followed):
+        if settings.RECIPE_FAST_SERIALIZER:
+            return represent_recipes(page, self.request, followed)
+        return self.get_serializer(page, many=True).data
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            recipe_id = int(kwargs['pk'])
+        except ValueError:
+            return super().retrieve(request, *args, **kwargs)
+        return conditional_response(
+            request,
+            get_recipe_validators(request, recipe_id),
+            lambda: self.recipe_response(request, recipe_id, *args, **kwargs)
+        )
+
+    def recipe_response(self, request, recipe_id, *args, **kwargs):
+        if not settings.RECIPE_FAST_SERIALIZER:
+            return super().retrieve(request, *args, **kwargs)
+        recipe = self.filter_queryset(self.get_queryset()).filter(
+            pk=recipe_id
+        ).values(*RECIPE_FIELDS).first()
+        if recipe is None:
+            raise NotFound
+        return Response(represent_recipes(
+            [recipe], request, get_user_followed_author_ids(request.user)
+        )[0])
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
     def get_serializer_class(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'feed']:
             return RecipeListSerializer
         return CreateRecipeSerializer
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(VersionedCacheMixin,
+                        viewsets.ReadOnlyModelViewSet):
+    cache_namespace = 'ingredients'
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     permission_classes = [AllowAny, ]
-    filter_backends = [SearchFilter]
-    search_fields = ['name', ]
+    filter_backends = [IngredientSearchFilter]
 
 
 @api_view(['get'])
 def show_subscribs(request):
-    user_obj = User.objects.filter(following__user=request.user)
-    paginator = PageNumberPagination()
+    authors = User.objects.filter(following__user=request.user).annotate(
+        is_subscribed=Value(True, output_field=BooleanField())
+    )
+    paginator = PageNumberPaginatorModified()
     paginator.page_size = 10
-    result_page = paginator.paginate_queryset(user_obj, request)
+    result_page = paginator.paginate_queryset(authors, request)
+    latest_recipes = Recipe.objects.latest_by_author(
+        [author.id for author in result_page],
+        SubscribersSerializer.get_recipes_limit(request)
+    )
+    for author in result_page:
+        author.latest_recipes = latest_recipes[author.id]
     serializer = SubscribersSerializer(
         result_page,
         many=True,
-        context={'current_user': request.user}
+        context={'request': request}
     )
     return paginator.get_paginated_response(serializer.data)
 
 
+def already_added(message):
+    return ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+
 class SubscribeView(APIView):
 
     def get(self, request, user_id):
         user = request.user
-        data = {
-            'user': user.id,
-            'author': user_id
-        }
-        serializer = SubscribeSerializer(
-            data=data, context={'request': request}
+        if not add_links(Subscribe, user.id, 'author', [user_id],
+                         exclude=[user.id]):
+            get_object_or_404(User, pk=user_id)
+            if user_id == user.id:
+                raise already_added('Невозможно подписаться на себя')
+            raise already_added('Вы уже подписаны')
+        invalidate_followed_authors(user.id)
+        author = User.objects.get(pk=user_id)
+        author.is_subscribed = True
+        serializer = SubscribersSerializer(
+            author, context={'request': request}
         )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
         return Response(serializer.data, status.HTTP_201_CREATED)
 
     def delete(self, request, user_id):
-        user = request.user
-        follow = get_object_or_404(
-            Subscribe,
-            user=user,
-            author_id=user_id
-        )
-        follow.delete()
+        if not remove_links(Subscribe, request.user.id, 'author', [user_id]):
+            raise NotFound
+        invalidate_followed_authors(request.user.id)
         return Response('Подписка удалена', status.HTTP_204_NO_CONTENT)
 
 
 class FavoriteViewSet(APIView):
 
+    @transaction.atomic
     def get(self, request, recipe_id):
-        user = request.user.id
-        data = {
-            'user': user,
-            'recipe': recipe_id
-        }
-        serializer = FavoriteSerializer(
-            data=data, context={'request': request}
+        if not add_links(Favorite, request.user.id, 'recipe', [recipe_id]):
+            get_object_or_404(Recipe, pk=recipe_id)
+            raise already_added('Рецепт уже добавлен в избранное')
+        change_favorites_count(recipe_id, 1)
+        invalidate_recipe_ids(Favorite, request.user.id)
+        serializer = RecipeShortSerializer(
+            Recipe.objects.get(pk=recipe_id), context={'request': request}
         )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
         return Response(serializer.data, status.HTTP_201_CREATED)
 
+    @transaction.atomic
     def delete(self, request, recipe_id):
-        user = request.user
-        favorite_recipe = get_object_or_404(
-            Favorite,
-            user=user,
-            recipe__id=recipe_id
-        )
-        favorite_recipe.delete()
+        if not remove_links(Favorite, request.user.id, 'recipe', [recipe_id]):
+            raise NotFound
+        change_favorites_count(recipe_id, -1)
+        invalidate_recipe_ids(Favorite, request.user.id)
         return Response(
             'Рецепт удален из избранного',
             status.HTTP_204_NO_CONTENT
@@ -126,59 +222,50 @@ class FavoriteViewSet(APIView):
 
 class PurchaseListView(APIView):
 
+    @transaction.atomic
     def get(self, request, recipe_id):
-        user = request.user.id
-        data = {
-            'user': user,
-            'recipe': recipe_id
-        }
-        serializer = PurchaseListSerializer(
-            data=data,
-            context={'request': request}
+        user = request.user
+        if not add_links(PurchaseList, user.id, 'recipe', [recipe_id],
+                         created_at=timezone.now()):
+            get_object_or_404(Recipe, pk=recipe_id)
+            raise already_added('Вы уже добавили рецепт в список покупок')
+        shopping_list.add_recipes(user.id, [recipe_id])
+        invalidate_recipe_ids(PurchaseList, user.id)
+        serializer = RecipeShortSerializer(
+            Recipe.objects.get(pk=recipe_id), context={'request': request}
         )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
         return Response(serializer.data, status.HTTP_201_CREATED)
 
+    @transaction.atomic
     def delete(self, request, recipe_id):
         user = request.user
-        purchace_list_recipe = get_object_or_404(
-            PurchaseList,
-            user=user,
-            recipe__id=recipe_id
-        )
-        purchace_list_recipe.delete()
+        if not remove_links(PurchaseList, user.id, 'recipe', [recipe_id]):
+            raise NotFound
+        shopping_list.remove_recipes(user.id, [recipe_id])
+        invalidate_recipe_ids(PurchaseList, user.id)
         return Response(
             'Рецепт удален из списка покупок',
             status.HTTP_204_NO_CONTENT
         )
 
 
-class DownloadPurchaseList(APIView):
-
-    def get(self, request):
-        shopping_cart = request.user.purchases.all()
-        purchase_list = {}
-        for purchase in shopping_cart:
-            ingredients = purchase.recipe.ingredientrecipe_set.all()
-            for ingredient in ingredients:
-                name = ingredient.ingredient.name
-                amount = ingredient.amount
-                unit = ingredient.ingredient.measurement_unit
-                if name not in purchase_list:
-                    purchase_list[name] = {
-                        'amount': amount,
-                        'unit': unit
-                    }
-                else:
-                    purchase_list[name]['amount'] = (purchase_list[name]
-                                                     ['amount'] + amount)
-        wishlist = []
-        for item in purchase_list:
-            wishlist.append(f'{item} ({purchase_list[item]["unit"]}) — '
-                            f'{purchase_list[item]["amount"]} \n')
-        wishlist.append('/n')
-        wishlist.append('FoodGram, 2021')
-        response = HttpResponse(wishlist, 'Content-Type: application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="wishlist.pdf"'
-        return response
+class BulkPurchaseListView(APIView):
+
+    @transaction.atomic
+    def post(self, request):
+        serializer = BulkPurchaseListSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = request.user
+        removed = remove_links(
+            PurchaseList, user.id, 'recipe',
+            serializer.validated_data['remove']
+        )
+        shopping_list.remove_recipes(user.id, removed)
+        added = add_links(
+            PurchaseList, user.id, 'recipe',
+            serializer.validated_data['add'], created_at=timezone.now()
+        )
+        shopping_list.add_recipes(user.id, added)
+        if added or removed:
+            invalidate_recipe_ids(PurchaseList, user.id)
+        return Response({'added': sorted(added), 'removed': sorted(removed)})
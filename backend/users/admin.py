@@ -2,4 +2,8 @@ from django.contrib import admin
 
 from .models import User
 
-admin.site.register(User)
+
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
+    list_display = ('username', 'email', 'recipes_count')
+    readonly_fields = ('recipes_count',)
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+
+from foodgram_api.cache import is_shared_cache
+from foodgram_api.metrics import record_cache
+
+TOKEN_KEY = 'auth_token:{}'
+
+
+def invalidate_tokens(keys):
+    if is_shared_cache():
+        cache.delete_many([TOKEN_KEY.format(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+
+    def authenticate_credentials(self, key):
+        if not is_shared_cache():
+            return super().authenticate_credentials(key)
+        cache_key = TOKEN_KEY.format(key)
+        token = cache.get(cache_key)
+        record_cache('auth_token', token is not None)
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(cache_key, token, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        return token.user, token
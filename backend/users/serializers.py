@@ -1,6 +1,7 @@
 from djoser.serializers import UserSerializer
 from rest_framework import serializers
 
+from foodgram_api.metrics import SerializerTimingMixin
 from recipes.models import Subscribe
 
 from .models import User
@@ -14,7 +15,7 @@ class CustomUserSerializer(UserSerializer):
         )
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     is_subscribed = serializers.SerializerMethodField()
 
     class Meta:
@@ -25,6 +26,8 @@ class UserSerializer(serializers.ModelSerializer):
         )
 
     def get_is_subscribed(self, obj):
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
         request = self.context.get('request')
         if request is None or request.user.is_anonymous:
             return False
@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import CachedTokenAuthentication
+
+User = get_user_model()
+
+
+class CachedTokenAuthenticationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user', email='user@example.com', password='password',
+            first_name='Имя', last_name='Фамилия'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.token = Token.objects.create(user=self.user)
+        self.authentication = CachedTokenAuthentication()
+
+    def authenticate(self):
+        return self.authentication.authenticate_credentials(self.token.key)
+
+    def revoke_in_another_worker(self):
+        with mock.patch('users.signals.invalidate_tokens'):
+            self.token.delete()
+
+    def test_local_cache_is_not_used(self):
+        self.assertEqual(self.authenticate()[0], self.user)
+        self.revoke_in_another_worker()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    @mock.patch('users.authentication.is_shared_cache', return_value=True)
+    def test_shared_cache_is_used_until_revoked(self, is_shared_cache):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate()[0], self.user)
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    @mock.patch('users.authentication.is_shared_cache', return_value=True)
+    def test_user_change_revokes_cached_token(self, is_shared_cache):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()